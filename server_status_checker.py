@@ -5,13 +5,34 @@ Monitors URLs and sends alerts when servers are down or fail.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from email.message import EmailMessage
+from logging.handlers import SysLogHandler
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+import asyncio
+import atexit
+import bisect
+import heapq
+import queue
+import random
+import smtplib
+import socket
+import threading
 import time
 import sqlite3
 import json
-from datetime import datetime
+import os
+import zlib
+from datetime import datetime, timedelta
 from pathlib import Path
+from types import MappingProxyType
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
 import sys
-from typing import List, Dict, Optional
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, List, Dict, Iterable, Mapping, NamedTuple, Optional, Tuple
 try:
     from win10toast import ToastNotifier
     WINDOWS_NOTIFICATIONS_AVAILABLE = True
@@ -25,42 +46,1857 @@ except ImportError as e:
         print(f"Or run: python install_notifications.py")
         print(f"Error details: {e}")
 
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    # Only needed for the asyncio backend (AsyncServerStatusChecker)
+    AIOHTTP_AVAILABLE = False
+
+# SQLite settings applied to every connection to the status database
+STORAGE_PROFILES = {
+    # SQLite defaults: rollback journal with synchronous=FULL
+    'default': {},
+    # Write-ahead log so readers never block the writer (and vice versa)
+    'wal': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -65536,        # 64 MB page cache
+        'mmap_size': 268435456,      # 256 MB memory-mapped I/O
+        'temp_store': 'MEMORY',
+    },
+}
+
+
+def connect_database(db_file: Path, storage_profile: str = 'default') -> sqlite3.Connection:
+    """Open a connection to the status database using a storage profile."""
+    if storage_profile not in STORAGE_PROFILES:
+        raise ValueError(f"Unknown storage profile: {storage_profile} "
+                         f"(choose from {', '.join(STORAGE_PROFILES)})")
+    conn = sqlite3.connect(db_file, timeout=10)
+    # Lets retention hand freed pages back to the file system; this only
+    # takes effect for a new database, so it must come before journal_mode
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    for pragma, value in STORAGE_PROFILES[storage_profile].items():
+        conn.execute(f"PRAGMA {pragma}={value}")
+    return conn
+
+
+def parse_duration(value: str) -> float:
+    """Parse a duration such as '30', '10s', '15m' or '1h' into seconds."""
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    value = value.strip().lower()
+    multiplier = 1
+    if value and value[-1] in units:
+        multiplier = units[value[-1]]
+        value = value[:-1]
+    seconds = float(value) * multiplier
+    if seconds <= 0:
+        raise ValueError("Duration must be positive")
+    return seconds
+
+
+def parse_target_line(line: str) -> Tuple[str, Dict[str, str]]:
+    """Split a urls.txt line into the URL and its key=value options.
+    
+    Example: ``https://pay.example.com/health interval=10s``
+    """
+    parts = line.split()
+    if not parts:
+        return "", {}
+    options = {}
+    for part in parts[1:]:
+        key, sep, value = part.partition('=')
+        if not sep or not key:
+            raise ValueError(f"Invalid option '{part}' (expected key=value)")
+        options[key.lower()] = value
+    return parts[0], options
+
+
+def format_target_line(url: str, options: Mapping[str, str]) -> str:
+    """Build the urls.txt line for a URL and its options (inverse of parse_target_line)."""
+    return " ".join([url] + [f"{key}={value}" for key, value in options.items()])
+
+
+def parse_target_lines(lines: Iterable[str], source) -> List[Tuple[str, Dict[str, str]]]:
+    """Return (url, options) for each URL line in urls.txt format.
+    
+    Blank lines and comments are skipped. Invalid options are reported
+    (naming ``source`` and the line number) and dropped, keeping the URL.
+    """
+    targets = []
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        try:
+            targets.append(parse_target_line(line))
+        except ValueError as e:
+            print(f"Ignoring options on line {line_number} of {source}: {e}")
+            targets.append((line.split()[0], {}))
+    return targets
+
+
+def read_target_file(path) -> List[Tuple[str, Dict[str, str]]]:
+    """Return (url, options) for each URL line of a file in urls.txt format."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_target_lines(f, path)
+
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: str) -> str:
+    """Return the canonical form of a URL, used to spot the same target written differently.
+    
+    Adds ``https://`` if there is no scheme, lowercases the scheme and host,
+    drops the default port and any fragment, and uses ``/`` for an empty path,
+    so ``Example.com`` and ``https://example.com:443/`` are the same URL.
+    """
+    url = url.strip()
+    if not url.lower().startswith(('http://', 'https://')):
+        url = 'https://' + url
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url  # Malformed host or port; leave it to the check to report
+    scheme = parts.scheme.lower()
+    host = parts.hostname or ''
+    if ':' in host:
+        host = f"[{host}]"  # IPv6 address
+    userinfo, at, _ = parts.netloc.rpartition('@')
+    netloc = userinfo + at + host
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        netloc += f":{port}"
+    return urlunsplit((scheme, netloc, parts.path or '/', parts.query, ''))
+
+
+class TargetSnapshot(NamedTuple):
+    """Immutable view of the monitored URLs at one version of a TargetRegistry."""
+    version: int
+    urls: Tuple[str, ...]
+    options: Mapping[str, Mapping[str, str]]  # Every URL, with its options (maybe empty)
+    canonical: Mapping[str, str]  # normalize_url(url) -> url as stored
+
+
+class TargetRegistry:
+    """Copy-on-write list of the monitored URLs, kept in sync with urls.txt.
+    
+    Readers call ``snapshot()`` and get an immutable TargetSnapshot, so a
+    sweep can iterate it while URLs are added or removed. Each edit
+    builds a new snapshot with the next version number and swaps it in
+    under a lock. Saving to disk is left to a background thread that
+    waits until no edit has arrived for ``save_delay`` seconds and then
+    writes only the latest version, so a burst of edits costs one write
+    and callers never wait on disk. ``flush()`` forces a pending write.
+    
+    URLs are matched by their normalize_url() form in a hash map, so
+    membership checks are O(1) and a URL cannot be added twice under a
+    different spelling. URLs keep the spelling they were added with,
+    which is also the key their history is stored under. Every edit
+    copies the URL list (well under a millisecond for 10k URLs),
+    so add or remove many URLs with ``add_many`` and ``remove_many``,
+    which publish one snapshot per batch.
+    """
+    
+    def __init__(self, urls_file, save_delay: float = 1.0):
+        self.urls_file = Path(urls_file)
+        self.save_delay = save_delay
+        self._snapshot = TargetSnapshot(0, (), MappingProxyType({}), MappingProxyType({}))
+        # The plain dicts behind the current snapshot; copied, never changed, on edit
+        self._options: Dict[str, Mapping[str, str]] = {}
+        self._canonical: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._saved_version = 0
+        self._last_edit = 0.0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="target-registry-writer",
+                                        daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def __contains__(self, url: str) -> bool:
+        return normalize_url(url) in self._snapshot.canonical
+    
+    def __len__(self) -> int:
+        return len(self._snapshot.urls)
+    
+    def snapshot(self) -> TargetSnapshot:
+        """Return the current snapshot (never modified after it is published)."""
+        return self._snapshot
+    
+    def load(self) -> bool:
+        """Replace the targets with the contents of urls.txt; False if the file is missing."""
+        if not self.urls_file.exists():
+            return False
+        options = {}
+        canonical = {}
+        for url, url_options in read_target_file(self.urls_file):
+            # A repeated URL keeps its first position and spelling but its last options
+            url = canonical.setdefault(normalize_url(url), url)
+            options[url] = MappingProxyType(url_options)
+        with self._lock:
+            self._publish(options, canonical, persist=False)
+        return True
+    
+    def add(self, url: str, options: Optional[Mapping[str, str]] = None) -> bool:
+        """Add a URL; False if it is already monitored."""
+        return bool(self.add_many([(url, options or {})]))
+    
+    def remove(self, url: str) -> bool:
+        """Remove a URL; False if it was not monitored."""
+        return bool(self.remove_many([url]))
+    
+    def add_many(self, targets: Iterable[Tuple[str, Mapping[str, str]]]) -> List[str]:
+        """Add (url, options) pairs in one edit; return the URLs that were not already monitored."""
+        keyed = [(normalize_url(url), url, options) for url, options in targets]
+        added = []
+        with self._lock:
+            options = self._options.copy()
+            canonical = self._canonical.copy()
+            for key, url, url_options in keyed:
+                if key in canonical:
+                    continue
+                canonical[key] = url
+                options[url] = MappingProxyType(dict(url_options))
+                added.append(url)
+            if added:
+                self._publish(options, canonical)
+        return added
+    
+    def remove_many(self, urls: Iterable[str]) -> List[str]:
+        """Remove URLs in one edit; return the removed URLs as they were stored."""
+        keys = [normalize_url(url) for url in urls]
+        removed = []
+        with self._lock:
+            options = self._options.copy()
+            canonical = self._canonical.copy()
+            for key in keys:
+                url = canonical.pop(key, None)
+                if url is not None:
+                    del options[url]
+                    removed.append(url)
+            if removed:
+                self._publish(options, canonical)
+        return removed
+    
+    def _publish(self, options: Dict[str, Mapping[str, str]], canonical: Dict[str, str],
+                 persist: bool = True):
+        """Swap in a new snapshot built from ``options`` (lock held)."""
+        version = self._snapshot.version + 1
+        self._options, self._canonical = options, canonical
+        self._snapshot = TargetSnapshot(version, tuple(options), MappingProxyType(options),
+                                        MappingProxyType(canonical))
+        if persist:
+            self._last_edit = time.monotonic()
+            self._changed.notify_all()
+        else:
+            self._saved_version = version
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write any pending edits now; False if they were not saved within ``timeout``."""
+        with self._lock:
+            version = self._snapshot.version
+            self._last_edit = 0.0  # Skip the rest of the debounce delay
+            self._changed.notify_all()
+            self._changed.wait_for(
+                lambda: self._saved_version >= version or not self._thread.is_alive(), timeout)
+            return self._saved_version >= version
+    
+    def close(self, timeout: float = 5.0):
+        """Write any pending edits and stop the writer thread."""
+        with self._lock:
+            self._closed = True
+            self._changed.notify_all()
+        self._thread.join(timeout)
+    
+    def _run(self):
+        """Writer thread: save the latest snapshot once edits settle down."""
+        with self._lock:
+            while True:
+                if self._saved_version == self._snapshot.version:
+                    if self._closed:
+                        return
+                    self._changed.wait()
+                    continue
+                delay = self._last_edit + self.save_delay - time.monotonic()
+                if delay > 0 and not self._closed:
+                    self._changed.wait(delay)
+                    continue
+                snapshot = self._snapshot
+                # Write without the lock so edits are never held up by the disk
+                self._lock.release()
+                try:
+                    saved = self._write(snapshot)
+                finally:
+                    self._lock.acquire()
+                if saved or self._closed:
+                    self._saved_version = max(self._saved_version, snapshot.version)
+                else:
+                    self._last_edit = time.monotonic()  # Try again after save_delay
+                self._changed.notify_all()
+    
+    def _write(self, snapshot: TargetSnapshot) -> bool:
+        """Atomically replace urls.txt with ``snapshot``."""
+        temp_file = self.urls_file.with_name(self.urls_file.name + '.tmp')
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                for url in snapshot.urls:
+                    f.write(format_target_line(url, snapshot.options[url]) + '\n')
+            os.replace(temp_file, self.urls_file)
+            return True
+        except OSError as e:
+            print(f"Error saving {self.urls_file}: {e}")
+            return False
+
+
+# How check_url requests a URL (set per URL with the ``method`` option)
+PROBE_METHODS = {
+    'get': "GET and download the whole body",
+    'head': "HEAD request, no body",
+    'range': "GET with 'Range: bytes=0-0' (206 counts as success)",
+    'stream': "GET that closes the connection once headers arrive",
+}
+
+
+# Per-thread state of the probe currently running on that thread
+_probe_context = threading.local()
+
+
+def _system_resolve(host: str, port: int) -> Tuple[str, ...]:
+    """Resolve a host name to every address returned by the system resolver, in order."""
+    addresses = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+    return tuple(dict.fromkeys(info[4][0] for info in addresses))
+
+
+class DNSCache:
+    """Thread-safe cache of host name lookups with a size cap.
+    
+    Successful lookups are kept for ``ttl`` seconds and failed lookups
+    for ``negative_ttl`` seconds, so a missing host does not hit the
+    resolver on every check either. The system resolver does not expose
+    record TTLs, so ``ttl`` should be set no higher than the TTL of the
+    monitored records. The least recently used entries are dropped once
+    more than ``max_entries`` hosts are cached.
+    """
+    
+    def __init__(self, ttl: float = 300.0, negative_ttl: float = 30.0,
+                 max_entries: int = 1024,
+                 resolver: Callable[[str, int], Tuple[str, ...]] = _system_resolve):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max(1, max_entries)
+        self.resolver = resolver
+        # host -> (expires_at, addresses, error message or None)
+        self._entries: "OrderedDict[str, Tuple[float, Tuple[str, ...], Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._negative_hits = 0
+        self._misses = 0
+        self._lookup_time = 0.0
+        self._lookups_timed = 0
+    
+    def resolve(self, host: str, port: int) -> Tuple[str, ...]:
+        """Return the addresses of ``host``, raising socket.gaierror if it does not resolve."""
+        key = host.lower()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                if entry[2] is not None:
+                    self._negative_hits += 1
+                    raise socket.gaierror(socket.EAI_NONAME, entry[2])
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+        
+        start = time.perf_counter()
+        try:
+            addresses = self.resolver(host, port)
+        except socket.gaierror as e:
+            self._store(key, (time.monotonic() + self.negative_ttl, (), str(e)))
+            raise
+        elapsed = time.perf_counter() - start
+        
+        self._store(key, (time.monotonic() + self.ttl, addresses, None))
+        with self._lock:
+            self._lookup_time += elapsed
+            self._lookups_timed += 1
+        return addresses
+    
+    def _store(self, key: str, entry: Tuple[float, Tuple[str, ...], Optional[str]]):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Forget all cached lookups."""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict:
+        """Return hit/miss counters and the estimated lookup time saved."""
+        with self._lock:
+            lookups = self._hits + self._negative_hits + self._misses
+            average = self._lookup_time / self._lookups_timed if self._lookups_timed else 0.0
+            return {
+                'entries': len(self._entries),
+                'hits': self._hits,
+                'negative_hits': self._negative_hits,
+                'misses': self._misses,
+                'hit_ratio': round((self._hits + self._negative_hits) / lookups, 3) if lookups else None,
+                'avg_lookup_ms': round(average * 1000, 3),
+                # Each hit saved roughly one average lookup
+                'time_saved_ms': round((self._hits + self._negative_hits) * average * 1000, 1),
+            }
+
+
+class CachedAsyncResolver(aiohttp.abc.AbstractResolver if AIOHTTP_AVAILABLE else object):
+    """aiohttp resolver that looks host names up through a DNSCache.
+    
+    Lets the asyncio backend share the checker's cache, TTLs and
+    ``dns_stats()`` counters. Lookups run in the default executor because
+    the system resolver blocks.
+    """
+    
+    def __init__(self, cache: DNSCache):
+        self.cache = cache
+    
+    async def resolve(self, host: str, port: int = 0,
+                      family: int = socket.AF_INET) -> List[Dict]:
+        loop = asyncio.get_running_loop()
+        addresses = await loop.run_in_executor(None, self.cache.resolve, host, port)
+        results = []
+        for address in addresses:
+            address_family = socket.AF_INET6 if ':' in address else socket.AF_INET
+            if family in (socket.AF_UNSPEC, address_family):
+                results.append({'hostname': host, 'host': address, 'port': port,
+                                'family': address_family, 'proto': 0, 'flags': 0})
+        if not results:
+            raise socket.gaierror(socket.EAI_NONAME, f"No usable address for {host}")
+        return results
+    
+    async def close(self):
+        pass
+
+
+class _PhaseTimingMixin:
+    """Records DNS, TCP connect and TLS handshake times for new connections.
+    
+    Timings are added to ``_probe_context.phases`` when a probe is running
+    on the current thread. A probe that reuses a pooled connection records
+    no connection phases at all. Host names are looked up through
+    ``_probe_context.resolver`` (the checker's DNS cache) when one is set,
+    and each address is tried in turn until one accepts the connection,
+    as urllib3 does when it resolves the host itself.
+    """
+    
+    def _new_conn(self):
+        phases = getattr(_probe_context, 'phases', None)
+        resolver = getattr(_probe_context, 'resolver', None)
+        if phases is None and resolver is None:
+            return super()._new_conn()
+        phases = phases if phases is not None else {}
+        
+        # Resolve separately so DNS time can be told apart from connect time
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            addresses = (resolver or _system_resolve)(host, self.port)
+        except socket.gaierror as e:
+            phases['dns'] = phases.get('dns', 0.0) + (time.perf_counter() - start)
+            raise NewConnectionError(self, f"Failed to resolve '{host}' ({e})") from e
+        except OSError:
+            # Let urllib3 resolve the host itself and raise its usual error
+            addresses = ()
+        resolved = time.perf_counter()
+        phases['dns'] = phases.get('dns', 0.0) + (resolved - start)
+        
+        candidates = addresses or (host,)
+        try:
+            for index, address in enumerate(candidates):
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                    break
+                except ConnectTimeoutError:
+                    # Unreachable address (e.g. IPv6 without a route); try the next one
+                    if index == len(candidates) - 1:
+                        raise
+        finally:
+            self._dns_host = host
+        phases['connect'] = phases.get('connect', 0.0) + (time.perf_counter() - resolved)
+        return sock
+    
+    def connect(self):
+        phases = getattr(_probe_context, 'phases', None)
+        if phases is None or not isinstance(self, HTTPSConnection):
+            return super().connect()
+        
+        before = phases.get('dns', 0.0) + phases.get('connect', 0.0)
+        start = time.perf_counter()
+        super().connect()
+        # Whatever connect() spent beyond DNS and TCP connect was the TLS handshake
+        network = phases.get('dns', 0.0) + phases.get('connect', 0.0) - before
+        phases['tls'] = phases.get('tls', 0.0) + max(0.0, time.perf_counter() - start - network)
+
+
+class TimedHTTPConnection(_PhaseTimingMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_PhaseTimingMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTP adapter with idle connection reaping and pool reuse counters.
+    
+    ``pool_connections`` is the number of per-host pools kept and
+    ``pool_maxsize`` the connections kept per host. Hosts that have not
+    been used for ``idle_timeout`` seconds have their pooled connections
+    closed by ``reap_idle_connections`` before the server drops them.
+    """
+    
+    def __init__(self, pool_connections: int = 100, pool_maxsize: int = 20,
+                 pool_block: bool = False, idle_timeout: float = 90.0):
+        self.idle_timeout = idle_timeout
+        self._last_used: Dict[Tuple[str, str, int], float] = {}
+        self._stats_lock = threading.Lock()
+        self._retired_requests = 0
+        self._retired_connections = 0
+        super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                         pool_block=pool_block)
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        # Keep the counters of pools that are evicted or reaped
+        self.poolmanager.pools.dispose_func = self._dispose_pool
+        # Time the phases of every new connection
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
+    
+    def _dispose_pool(self, pool):
+        with self._stats_lock:
+            self._retired_requests += pool.num_requests
+            self._retired_connections += pool.num_connections
+        pool.close()
+    
+    @staticmethod
+    def _host_key(url: str) -> Tuple[str, str, int]:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        port = parts.port or (443 if scheme == 'https' else 80)
+        return scheme, (parts.hostname or '').lower(), port
+    
+    def send(self, request, **kwargs):
+        self._last_used[self._host_key(request.url)] = time.monotonic()
+        return super().send(request, **kwargs)
+    
+    def reap_idle_connections(self) -> int:
+        """Close pooled connections to hosts idle longer than ``idle_timeout``."""
+        cutoff = time.monotonic() - self.idle_timeout
+        idle_hosts = {key for key, last_used in list(self._last_used.items())
+                      if last_used < cutoff}
+        if not idle_hosts:
+            return 0
+        
+        reaped = 0
+        pools = self.poolmanager.pools
+        for pool_key in list(pools.keys()):
+            host_key = (pool_key.key_scheme, pool_key.key_host, pool_key.key_port)
+            if host_key in idle_hosts:
+                try:
+                    del pools[pool_key]  # Calls _dispose_pool
+                except KeyError:
+                    continue
+                reaped += 1
+        for host_key in idle_hosts:
+            self._last_used.pop(host_key, None)
+        return reaped
+    
+    def pool_stats(self) -> Dict:
+        """Return connection reuse counters for all pools created so far."""
+        with self._stats_lock:
+            requests_sent = self._retired_requests
+            new_connections = self._retired_connections
+        # Visiting pools in LRU order keeps their relative order unchanged
+        live_pools = [self.poolmanager.pools.get(key) for key in self.poolmanager.pools.keys()]
+        for pool in live_pools:
+            if pool is not None:
+                requests_sent += pool.num_requests
+                new_connections += pool.num_connections
+        reused = max(0, requests_sent - new_connections)
+        return {
+            'requests': requests_sent,
+            'pool_hits': reused,                  # Sent on an already open connection
+            'pool_misses': new_connections,       # Needed a new TCP (+TLS) connection
+            'hit_ratio': round(reused / requests_sent, 3) if requests_sent else None,
+            'host_pools': len(live_pools),
+        }
+
+
+class CheckScheduler:
+    """Priority queue of next-due times for per-URL check intervals.
+    
+    Each URL is rescheduled relative to its previous due time rather than
+    to when its check finished, so the cadence does not drift. Due times
+    are ``time.monotonic()`` values.
+    
+    With ``spread`` enabled, each URL's first check is offset by a stable
+    fraction of its interval derived from a hash of the URL, so checks are
+    spread evenly across the interval instead of all firing at once.
+    ``jitter`` adds a random delay of up to that fraction of the interval
+    to every dispatch; it never accumulates into the schedule.
+    
+    With ``backoff_cap`` set, a URL that keeps failing is checked less
+    often: after ``backoff_after`` failures in a row, each further failure
+    multiplies its interval by ``backoff_factor``, up to ``backoff_cap``
+    seconds. The first success restores the normal interval. Report
+    results with ``record_result``.
+    """
+    
+    def __init__(self, default_interval: float,
+                 get_interval: Optional[Callable[[str, float], float]] = None,
+                 spread: bool = False, jitter: float = 0.0,
+                 backoff_cap: Optional[float] = None, backoff_factor: float = 2.0,
+                 backoff_after: int = 3):
+        self.default_interval = default_interval
+        self.get_interval = get_interval or (lambda url, default: default)
+        self.spread = spread
+        self.jitter = min(max(jitter, 0.0), 1.0)
+        self.backoff_cap = backoff_cap
+        self.backoff_factor = max(1.0, backoff_factor)
+        self.backoff_after = max(1, backoff_after)
+        self._heap: List[Tuple[float, int, str]] = []
+        self._next_due: Dict[str, float] = {}  # Dispatch time (slot + jitter)
+        self._slot: Dict[str, float] = {}      # Un-jittered slot on the URL's grid
+        self._last_slot: Dict[str, float] = {} # Slot of the most recent dispatch
+        self._failures: Dict[str, int] = {}    # Consecutive failures (backoff only)
+        self._counter = 0
+    
+    def interval_for(self, url: str) -> float:
+        """Return the check interval for a URL in seconds."""
+        return self.get_interval(url, self.default_interval)
+    
+    def effective_interval(self, url: str) -> float:
+        """Return the interval for a URL including any failure backoff."""
+        interval = self.interval_for(url)
+        steps = self._failures.get(url, 0) - self.backoff_after + 1
+        if self.backoff_cap is None or steps <= 0:
+            return interval
+        backoff = interval * self.backoff_factor ** min(steps, 64)
+        return max(interval, min(backoff, self.backoff_cap))
+    
+    def record_result(self, url: str, success: bool):
+        """Update a URL's backoff after a check and move its next check to match."""
+        if self.backoff_cap is None or url not in self._slot:
+            return
+        failures = self._failures.get(url, 0)
+        if success:
+            if not failures:
+                return
+            del self._failures[url]
+        else:
+            self._failures[url] = failures + 1
+        
+        last_slot = self._last_slot.get(url)
+        interval = self.effective_interval(url)
+        if last_slot is not None and last_slot + interval != self._slot[url]:
+            self.schedule(url, last_slot + interval)
+    
+    @staticmethod
+    def stable_offset(url: str) -> float:
+        """Return a fraction in [0, 1) that is the same for a URL across runs."""
+        return zlib.crc32(url.encode('utf-8')) / 2 ** 32
+    
+    def schedule(self, url: str, due: float):
+        """Schedule (or reschedule) a URL to be checked at ``due``."""
+        self._slot[url] = due
+        if self.jitter:
+            due += random.uniform(0, self.jitter * self.interval_for(url))
+        # Older heap entries for this URL become stale and are skipped on pop
+        self._next_due[url] = due
+        self._counter += 1
+        heapq.heappush(self._heap, (due, self._counter, url))
+    
+    def sync(self, urls: List[str], now: Optional[float] = None):
+        """Start scheduling new URLs and stop scheduling removed ones."""
+        now = time.monotonic() if now is None else now
+        current = set(urls)
+        for url in list(self._next_due):
+            if url not in current:
+                del self._next_due[url]
+                del self._slot[url]
+                self._last_slot.pop(url, None)
+                self._failures.pop(url, None)
+        for url in urls:
+            if url not in self._next_due:
+                first_due = now
+                if self.spread:
+                    first_due += self.stable_offset(url) * self.interval_for(url)
+                self.schedule(url, first_due)
+    
+    def pop_due(self, now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """Return (url, slot_time) for every URL that is due and reschedule it."""
+        now = time.monotonic() if now is None else now
+        due_urls = []
+        while self._heap and self._heap[0][0] <= now:
+            due, _, url = heapq.heappop(self._heap)
+            if self._next_due.get(url) != due:
+                continue
+            
+            # Keep the original cadence; skip slots we are already past
+            slot = self._slot[url]
+            interval = self.effective_interval(url)
+            missed = int((now - slot) // interval)
+            self._last_slot[url] = slot + missed * interval
+            self.schedule(url, slot + (missed + 1) * interval)
+            due_urls.append((url, slot))
+        return due_urls
+    
+    def time_until_next(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the next URL is due, or None if nothing is scheduled."""
+        now = time.monotonic() if now is None else now
+        while self._heap and self._next_due.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - now)
+
+
+class AlertTracker:
+    """Per-URL UP / DEGRADED / DOWN state, so alerts fire on changes only.
+    
+    A URL goes DOWN once ``down_failures`` of its last ``down_window``
+    checks have failed, and is DEGRADED after a failed check that does
+    not reach that threshold. A DOWN or DEGRADED URL is UP again once
+    ``up_successes`` of its last ``up_window`` checks succeeded. URLs
+    start out UP. Each result is evaluated in constant time.
+    
+    >>> tracker = AlertTracker()
+    >>> [tracker.update('u', ok) for ok in (False, False, False, True, True)]
+    [('up', 'degraded'), None, ('degraded', 'down'), None, ('down', 'up')]
+    >>> tracker = AlertTracker(down_window=10, up_successes=1, up_window=1)
+    >>> [tracker.update('v', ok) for ok in (False, False, False, True)]
+    [('up', 'degraded'), None, ('degraded', 'down'), ('down', 'up')]
+    """
+    
+    UP = 'up'
+    DEGRADED = 'degraded'
+    DOWN = 'down'
+    
+    def __init__(self, down_failures: int = 3, down_window: int = 5,
+                 up_successes: int = 2, up_window: int = 2):
+        if not 1 <= down_failures <= down_window:
+            raise ValueError("down_failures must be between 1 and down_window")
+        if not 1 <= up_successes <= up_window:
+            raise ValueError("up_successes must be between 1 and up_window")
+        self.down_failures = down_failures
+        self.down_window = down_window
+        self.up_successes = up_successes
+        self.up_window = up_window
+        self._targets: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+    
+    def update(self, url: str, success: bool) -> Optional[Tuple[str, str]]:
+        """Record a check result; return ``(old_state, new_state)`` if the state changed."""
+        with self._lock:
+            target = self._targets.get(url)
+            if target is None:
+                target = self._targets[url] = {
+                    'state': self.UP,
+                    'down_results': deque(maxlen=self.down_window),
+                    'failures': 0,
+                    'up_results': deque(maxlen=self.up_window),
+                    'successes': 0,
+                }
+            
+            # Slide both windows, keeping their counts up to date
+            down_results, up_results = target['down_results'], target['up_results']
+            if len(down_results) == down_results.maxlen and not down_results[0]:
+                target['failures'] -= 1
+            down_results.append(success)
+            target['failures'] += not success
+            if len(up_results) == up_results.maxlen and up_results[0]:
+                target['successes'] -= 1
+            up_results.append(success)
+            target['successes'] += success
+            
+            old_state = target['state']
+            # Recovery is checked first: a DOWN URL still has failures in its
+            # down window, which must not outvote the up threshold
+            if (old_state != self.UP and success
+                    and target['successes'] >= self.up_successes):
+                new_state = self.UP
+                # Start counting failures afresh after a recovery
+                down_results.clear()
+                target['failures'] = 0
+            elif target['failures'] >= self.down_failures:
+                new_state = self.DOWN
+            elif old_state == self.UP and not success:
+                new_state = self.DEGRADED
+            else:
+                new_state = old_state
+            target['state'] = new_state
+        
+        if new_state != old_state:
+            return old_state, new_state
+        return None
+    
+    def state(self, url: str) -> str:
+        """Return the current state of a URL (UP if it has not been checked)."""
+        with self._lock:
+            target = self._targets.get(url)
+            return target['state'] if target else self.UP
+    
+    def forget(self, url: str):
+        """Drop the state of a URL that is no longer monitored."""
+        with self._lock:
+            self._targets.pop(url, None)
+
+
+# Version of the status_log.db layout, stored in PRAGMA user_version
+SCHEMA_VERSION = 2
+
+# Small-integer codes stored in status_logs.status_id (names in the statuses table)
+STATUS_CODES = {
+    'unknown': 0,
+    'success': 1,
+    'failed': 2,
+    'timeout': 3,
+    'connection_error': 4,
+    'error': 5,
+    'skipped': 6,
+}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+# Rollup tables (status_rollup_<name>) and the width of their buckets in seconds
+ROLLUP_RESOLUTIONS = {'1m': 60, '1h': 3600, '1d': 86400}
+
+# Upper bounds in seconds of the latency histogram kept in each rollup row;
+# percentiles are interpolated within these buckets
+LATENCY_HISTOGRAM_BOUNDS = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.15, 0.2, 0.3, 0.4, 0.5,
+    0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 7.5, 10.0, float('inf')
+)
+
+
+def rollup_bucket_start(timestamp: datetime, resolution: str) -> datetime:
+    """Return the start of the rollup bucket that contains ``timestamp``."""
+    if resolution == '1m':
+        return timestamp.replace(second=0, microsecond=0)
+    if resolution == '1h':
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    if resolution == '1d':
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unknown rollup resolution: {resolution}")
+
+
+def histogram_percentile(histogram: List[int], q: float,
+                         latency_min: float, latency_max: float) -> Optional[float]:
+    """Estimate the ``q`` quantile (0-1) of the latencies counted in ``histogram``."""
+    total = sum(histogram)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for index, count in enumerate(histogram):
+        if count and seen + count >= rank:
+            lower = LATENCY_HISTOGRAM_BOUNDS[index - 1] if index else 0.0
+            upper = LATENCY_HISTOGRAM_BOUNDS[index]
+            lower = max(lower, latency_min)
+            upper = min(upper, latency_max)
+            value = lower + (upper - lower) * (rank - seen) / count
+            return round(min(max(value, latency_min), latency_max), 3)
+        seen += count
+    return round(latency_max, 3)
+
+
+def update_rollups(conn: sqlite3.Connection, checks: List[Dict]):
+    """Fold checks into the 1-minute, 1-hour and 1-day rollup tables.
+    
+    Each check needs ``url_id``, ``status``, ``status_code``,
+    ``response_time`` and ``timestamp``. Runs inside the caller's
+    transaction. Skipped checks are left out, and latency statistics only
+    cover checks that got an HTTP response.
+    """
+    buckets: Dict[Tuple[str, int, datetime], Dict] = {}
+    for check in checks:
+        if check['status'] == 'skipped':
+            continue  # Not a check of the server
+        latency = check['response_time'] if check['status_code'] is not None else None
+        for resolution in ROLLUP_RESOLUTIONS:
+            key = (resolution, check['url_id'], rollup_bucket_start(check['timestamp'], resolution))
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = {
+                    'count': 0, 'success_count': 0, 'latency_count': 0,
+                    'latency_min': None, 'latency_max': None, 'latency_sum': 0.0,
+                    'histogram': [0] * len(LATENCY_HISTOGRAM_BOUNDS),
+                }
+            bucket['count'] += 1
+            if check['status'] == 'success':
+                bucket['success_count'] += 1
+            if latency is not None:
+                bucket['latency_count'] += 1
+                bucket['latency_sum'] += latency
+                bucket['latency_min'] = latency if bucket['latency_min'] is None else min(bucket['latency_min'], latency)
+                bucket['latency_max'] = latency if bucket['latency_max'] is None else max(bucket['latency_max'], latency)
+                bucket['histogram'][bisect.bisect_left(LATENCY_HISTOGRAM_BOUNDS, latency)] += 1
+    
+    for (resolution, url_id, bucket_start), bucket in buckets.items():
+        table = f"status_rollup_{resolution}"
+        existing = conn.execute(f'''
+            SELECT count, success_count, latency_count, latency_min, latency_max,
+                   latency_sum, histogram
+            FROM {table} WHERE url_id = ? AND bucket_start = ?
+        ''', (url_id, bucket_start)).fetchone()
+        if existing:
+            count, success_count, latency_count, latency_min, latency_max, latency_sum, histogram = existing
+            bucket['count'] += count
+            bucket['success_count'] += success_count
+            bucket['latency_count'] += latency_count
+            bucket['latency_sum'] += latency_sum
+            for name, value, pick in (('latency_min', latency_min, min), ('latency_max', latency_max, max)):
+                if value is not None:
+                    bucket[name] = value if bucket[name] is None else pick(bucket[name], value)
+            bucket['histogram'] = [a + b for a, b in zip(bucket['histogram'], json.loads(histogram))]
+        
+        percentiles = [None, None, None]
+        if bucket['latency_count']:
+            percentiles = [histogram_percentile(bucket['histogram'], q, bucket['latency_min'],
+                                                bucket['latency_max'])
+                           for q in (0.5, 0.95, 0.99)]
+        latency_avg = (round(bucket['latency_sum'] / bucket['latency_count'], 3)
+                       if bucket['latency_count'] else None)
+        conn.execute(f'''
+            INSERT OR REPLACE INTO {table}
+            (url_id, bucket_start, count, success_count, latency_count, latency_min,
+             latency_avg, latency_max, latency_sum, latency_p50, latency_p95,
+             latency_p99, histogram)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            url_id, bucket_start, bucket['count'], bucket['success_count'],
+            bucket['latency_count'], bucket['latency_min'], latency_avg,
+            bucket['latency_max'], bucket['latency_sum'], *percentiles,
+            json.dumps(bucket['histogram'], separators=(',', ':'))
+        ))
+
+
+def update_current_status(conn: sqlite3.Connection, checks: List[Dict]):
+    """Fold checks into the current_status table (one row per URL).
+    
+    Each check needs ``url_id``, ``status_id``, ``status_code``,
+    ``response_time``, ``error_id`` and ``timestamp``. Runs inside the
+    caller's transaction. Checks older than the stored one and skipped
+    checks are ignored.
+    """
+    latest: Dict[int, Optional[Dict]] = {}
+    updates: Dict[int, Dict] = {}
+    for check in sorted(checks, key=lambda check: check['timestamp']):
+        if check['status_id'] == STATUS_CODES['skipped']:
+            continue
+        url_id = check['url_id']
+        if url_id not in latest:
+            row = conn.execute('''
+                SELECT status_id, last_checked, since, consecutive_failures
+                FROM current_status WHERE url_id = ?
+            ''', (url_id,)).fetchone()
+            latest[url_id] = None
+            if row:
+                latest[url_id] = {
+                    'status_id': row[0],
+                    'last_checked': datetime.fromisoformat(row[1]),
+                    'since': row[2],
+                    'consecutive_failures': row[3],
+                }
+        current = latest[url_id]
+        if current is not None and check['timestamp'] < current['last_checked']:
+            continue
+        
+        since = check['timestamp']
+        if current is not None and current['status_id'] == check['status_id']:
+            since = current['since']
+        failures = 0
+        if check['status_id'] != STATUS_CODES['success']:
+            failures = (current['consecutive_failures'] if current else 0) + 1
+        latest[url_id] = updates[url_id] = {
+            'url_id': url_id,
+            'status_id': check['status_id'],
+            'status_code': check['status_code'],
+            'response_time': check['response_time'],
+            'error_id': check['error_id'],
+            'last_checked': check['timestamp'],
+            'since': since,
+            'consecutive_failures': failures,
+        }
+    
+    conn.executemany('''
+        INSERT OR REPLACE INTO current_status
+        (url_id, status_id, status_code, response_time, error_id, last_checked, since,
+         consecutive_failures)
+        VALUES (:url_id, :status_id, :status_code, :response_time, :error_id,
+                :last_checked, :since, :consecutive_failures)
+    ''', list(updates.values()))
+
+
+class RetentionPolicy:
+    """Deletes old status data in small chunks so the database stays bounded.
+    
+    Raw rows in status_logs older than ``raw_age`` seconds are deleted;
+    their summary stays in the rollup tables, so old history is kept at
+    a coarser resolution. Rows logged before the rollup tables existed
+    are folded into them before being deleted. Rollup buckets are kept
+    for ``rollup_ages[resolution]`` seconds (None keeps them forever).
+    
+    ``run_chunk`` removes at most ``chunk_size`` rows per transaction;
+    StatusLogWriter calls it between batches, every ``interval`` seconds
+    while there is nothing to delete.
+    """
+    
+    DEFAULT_ROLLUP_AGES = {'1m': 7 * 86400, '1h': 90 * 86400, '1d': None}
+    
+    def __init__(self, raw_age: float, rollup_ages: Optional[Dict[str, Optional[float]]] = None,
+                 chunk_size: int = 1000, interval: float = 300.0, vacuum_pages: int = 1000):
+        self.raw_age = raw_age
+        self.rollup_ages = dict(self.DEFAULT_ROLLUP_AGES)
+        self.rollup_ages.update(rollup_ages or {})
+        self.chunk_size = max(1, chunk_size)
+        self.interval = interval
+        self.vacuum_pages = vacuum_pages
+        self.deleted_rows = 0
+        self._rollup_since: Optional[str] = None
+    
+    def run_chunk(self, conn: sqlite3.Connection) -> bool:
+        """Delete one chunk of expired rows; return True if more are waiting."""
+        now = datetime.now()
+        deleted = self._expire_raw_rows(conn, now - timedelta(seconds=self.raw_age))
+        if deleted < self.chunk_size:
+            for resolution, age in self.rollup_ages.items():
+                if age is None:
+                    continue
+                deleted += self._expire_rollups(conn, resolution, now - timedelta(seconds=age))
+                if deleted >= self.chunk_size:
+                    break
+        
+        self.deleted_rows += deleted
+        
+        # Return freed pages to the file system a bounded number at a time
+        # (no-op unless auto_vacuum=INCREMENTAL)
+        conn.execute(f"PRAGMA incremental_vacuum({self.vacuum_pages})").fetchall()
+        freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        return deleted >= self.chunk_size or (auto_vacuum == 2 and freelist > 0)
+    
+    def _expire_raw_rows(self, conn: sqlite3.Connection, cutoff: datetime) -> int:
+        if self._rollup_since is None:
+            row = conn.execute(
+                "SELECT value FROM storage_meta WHERE key = 'rollup_since'").fetchone()
+            self._rollup_since = row[0] if row else ''
+        
+        rows = conn.execute('''
+            SELECT id, url_id, status_code, response_time, status_id, timestamp
+            FROM status_logs WHERE timestamp < ? ORDER BY timestamp LIMIT ?
+        ''', (cutoff, self.chunk_size)).fetchall()
+        if not rows:
+            return 0
+        
+        unrolled = [{
+            'url_id': url_id,
+            'status_code': status_code,
+            'response_time': response_time,
+            'status': STATUS_NAMES.get(status_id, 'unknown'),
+            'timestamp': datetime.fromisoformat(timestamp)
+        } for _, url_id, status_code, response_time, status_id, timestamp in rows
+            if timestamp < self._rollup_since]
+        with conn:
+            if unrolled:
+                update_rollups(conn, unrolled)
+            conn.executemany("DELETE FROM status_logs WHERE id = ?", [(row[0],) for row in rows])
+        return len(rows)
+    
+    def _expire_rollups(self, conn: sqlite3.Connection, resolution: str, cutoff: datetime) -> int:
+        table = f"status_rollup_{resolution}"
+        with conn:
+            cursor = conn.execute(f'''
+                DELETE FROM {table} WHERE (url_id, bucket_start) IN (
+                    SELECT url_id, bucket_start FROM {table} WHERE bucket_start < ? LIMIT ?
+                )
+            ''', (cutoff, self.chunk_size))
+        return cursor.rowcount
+
+
+class StatusLogWriter:
+    """Background writer that owns one SQLite connection for status logs.
+    
+    Results are queued by ``put`` and written by a dedicated thread with
+    ``executemany`` in one transaction per batch. A batch is written once
+    it reaches ``batch_size`` rows or ``flush_interval_ms`` after its first
+    row arrived, whichever comes first. The rollup tables are updated in
+    the same transaction. When a ``retention`` policy is given, the writer
+    also deletes expired rows chunk by chunk, between batches or while idle.
+    """
+    
+    INSERT_SQL = '''
+        INSERT INTO status_logs
+        (url_id, status_code, response_time, status_id, error_id, timestamp, ttfb,
+         dns_time, connect_time, tls_time, connection_reused)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    # Most distinct error messages kept in the in-memory id cache
+    MAX_CACHED_ERRORS = 10000
+    
+    _STOP = object()
+    
+    def __init__(self, db_file: Path, batch_size: int = 500, flush_interval_ms: int = 500,
+                 storage_profile: str = 'default', retention: Optional[RetentionPolicy] = None):
+        self.db_file = Path(db_file)
+        self.storage_profile = storage_profile
+        self.retention = retention
+        self._next_maintenance = time.monotonic()
+        self._target_ids: Dict[str, int] = {}
+        self._error_ids: Dict[str, int] = {}
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0, flush_interval_ms) / 1000.0
+        self.queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="status-log-writer",
+                                        daemon=True)
+        self._thread.start()
+        
+        # Write anything still queued when the interpreter exits
+        atexit.register(self.close)
+    
+    def put(self, result: Dict):
+        """Queue a check result for writing."""
+        if self._closed:
+            raise RuntimeError("Status log writer is closed")
+        self.queue.put(result)
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far has been written."""
+        if self._closed or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+    
+    def close(self):
+        """Write remaining results and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self.queue.put(self._STOP)
+        self._thread.join()
+    
+    def _run(self):
+        conn = connect_database(self.db_file, self.storage_profile)
+        pending: List[Dict] = []
+        deadline = None
+        try:
+            while True:
+                timeout = None
+                if pending:
+                    timeout = max(0.0, deadline - time.monotonic())
+                elif self.retention is not None:
+                    timeout = max(0.0, self._next_maintenance - time.monotonic())
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+                    if not pending:
+                        self._run_maintenance(conn)
+                        continue
+                
+                if isinstance(item, dict):
+                    if not pending:
+                        deadline = time.monotonic() + self.flush_interval
+                    pending.append(item)
+                    if len(pending) < self.batch_size and time.monotonic() < deadline:
+                        continue
+                
+                self._write_batch(conn, pending)
+                pending = []
+                
+                if isinstance(item, threading.Event):
+                    item.set()
+                elif item is self._STOP:
+                    break
+                
+                # Under steady load the queue is never empty, so retention
+                # also runs between batches once it is due
+                if self.retention is not None and time.monotonic() >= self._next_maintenance:
+                    self._run_maintenance(conn)
+        finally:
+            conn.close()
+    
+    def _run_maintenance(self, conn: sqlite3.Connection):
+        """Run one retention chunk; come back immediately if more is waiting."""
+        more = False
+        try:
+            more = self.retention.run_chunk(conn)
+        except sqlite3.Error as e:
+            print(f"Error applying retention policy: {e}")
+        delay = 0.0 if more else self.retention.interval
+        self._next_maintenance = time.monotonic() + delay
+    
+    @staticmethod
+    def _dictionary_id(conn: sqlite3.Connection, table: str, column: str, value: str,
+                       cache: Dict[str, int]) -> int:
+        """Return the id of ``value`` in a dictionary table, adding it if needed."""
+        row_id = cache.get(value)
+        if row_id is None:
+            conn.execute(f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", (value,))
+            row_id = conn.execute(f"SELECT id FROM {table} WHERE {column} = ?",
+                                  (value,)).fetchone()[0]
+            cache[value] = row_id
+        return row_id
+    
+    def _write_batch(self, conn: sqlite3.Connection, results: List[Dict]):
+        """Insert a batch of results in a single transaction."""
+        if not results:
+            return
+        if len(self._error_ids) > self.MAX_CACHED_ERRORS:
+            self._error_ids.clear()
+        try:
+            with conn:
+                rows = []
+                checks = []
+                for result in results:
+                    url_id = self._dictionary_id(conn, 'targets', 'url', result['url'],
+                                                 self._target_ids)
+                    error_id = None
+                    if result['error_message']:
+                        error_id = self._dictionary_id(conn, 'error_messages', 'message',
+                                                       result['error_message'], self._error_ids)
+                    rows.append((
+                        url_id,
+                        result['status_code'],
+                        result['response_time'],
+                        STATUS_CODES.get(result['status'], STATUS_CODES['unknown']),
+                        error_id,
+                        result['timestamp'],
+                        result.get('ttfb'),
+                        result.get('dns_time'),
+                        result.get('connect_time'),
+                        result.get('tls_time'),
+                        result.get('connection_reused')
+                    ))
+                    checks.append({
+                        'url_id': url_id,
+                        'status': result['status'],
+                        'status_id': rows[-1][3],
+                        'status_code': result['status_code'],
+                        'response_time': result['response_time'],
+                        'error_id': error_id,
+                        'timestamp': result['timestamp'],
+                    })
+                conn.executemany(self.INSERT_SQL, rows)
+                update_rollups(conn, checks)
+                update_current_status(conn, checks)
+        except sqlite3.Error as e:
+            # Ids added in the rolled-back transaction no longer exist
+            self._target_ids.clear()
+            self._error_ids.clear()
+            print(f"Error writing {len(results)} status log(s): {e}")
+
+
+# Statuses that mean a server is down (see STATUS_CODES)
+FAILURE_STATUSES = ('failed', 'timeout', 'connection_error', 'error')
+
+
+def format_notification(alerts: List[Dict], dropped: int = 0) -> Tuple[str, str]:
+    """Return the title and message of a notification for one or more alerts.
+    
+    A single alert gets its own message; several are summarized, e.g.
+    "37 targets down".
+    """
+    title = "Server Status Alert"
+    if len(alerts) == 1 and not dropped:
+        alert = alerts[0]
+        if alert['status'] == 'recovered':
+            return title, f"Server recovered: {alert['url']}"
+        message = f"Server failed: {alert['url']}"
+        if alert['error_message']:
+            message += f"\nError: {alert['error_message']}"
+        return title, message
+    
+    lines = []
+    for label, urls in (
+        ('down', [alert['url'] for alert in alerts if alert['status'] != 'recovered']),
+        ('recovered', [alert['url'] for alert in alerts if alert['status'] == 'recovered'])
+    ):
+        if not urls:
+            continue
+        listed = ", ".join(urls[:3])
+        if len(urls) > 3:
+            listed += f" and {len(urls) - 3} more"
+        lines.append(f"{len(urls)} target{'s' if len(urls) != 1 else ''} {label}: {listed}")
+    if dropped:
+        lines.append(f"({dropped} more alert(s) dropped)")
+    return title, "\n".join(lines)
+
+
+class NotificationDispatcher:
+    """Deliver notifications on a background thread, merging bursts.
+    
+    ``notify`` never blocks: alerts go into a queue of at most
+    ``max_queue`` entries and are dropped (and counted) when it is full.
+    The worker waits ``coalesce_window`` seconds after the first alert of
+    a burst and hands everything that arrived meanwhile to ``deliver`` in
+    one call, keeping only the latest alert per URL.
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, deliver: Callable[[List[Dict], int], None],
+                 coalesce_window: float = 2.0, max_queue: int = 1000):
+        self.deliver = deliver
+        self.coalesce_window = max(0.0, coalesce_window)
+        self.queue: queue.Queue = queue.Queue(maxsize=max(1, max_queue))
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="notification-dispatcher",
+                                        daemon=True)
+        self._thread.start()
+        
+        # Deliver anything still queued when the interpreter exits
+        atexit.register(self.close)
+    
+    def notify(self, url: str, status: str, error_message: Optional[str] = None) -> bool:
+        """Queue an alert; return False if it was dropped."""
+        if self._closed:
+            return False
+        try:
+            self.queue.put_nowait({
+                'url': url,
+                'status': status,
+                'error_message': error_message,
+                'timestamp': datetime.now()
+            })
+            return True
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+            return False
+    
+    def close(self, timeout: float = 5.0):
+        """Deliver queued alerts and stop the worker, waiting at most ``timeout`` seconds."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+    
+    def _run(self):
+        stop = False
+        while not stop:
+            item = self.queue.get()
+            if item is self._STOP:
+                break
+            
+            # Collect the rest of the burst
+            alerts = {item['url']: item}
+            deadline = time.monotonic() + self.coalesce_window
+            while True:
+                try:
+                    item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stop = True
+                    break
+                alerts.pop(item['url'], None)
+                alerts[item['url']] = item
+            
+            with self._dropped_lock:
+                dropped, self.dropped = self.dropped, 0
+            try:
+                self.deliver(list(alerts.values()), dropped)
+            except Exception as e:
+                print(f"Error delivering notification: {e}")
+
+
+class Notifier:
+    """Base class for notification backends.
+    
+    Each notifier gets its own NotificationDispatcher, so it receives
+    alerts in batches and a slow backend never delays another.
+    Subclasses implement ``send`` and raise on failure; ``deliver``
+    retries a failed batch ``retries`` times with exponential backoff,
+    starting at ``retry_delay`` seconds.
+    """
+    
+    name = 'notifier'
+    
+    def __init__(self, retries: int = 2, retry_delay: float = 1.0,
+                 coalesce_window: float = 2.0):
+        self.retries = max(0, retries)
+        self.retry_delay = retry_delay
+        self.coalesce_window = coalesce_window
+    
+    def deliver(self, alerts: List[Dict], dropped: int = 0) -> bool:
+        """Send a batch of alerts, retrying on failure; return True if it was sent."""
+        delay = self.retry_delay
+        for attempt in range(self.retries + 1):
+            try:
+                self.send(alerts, dropped)
+                return True
+            except Exception as e:
+                if attempt == self.retries:
+                    print(f"Error sending {self.name} notification: {e}")
+                    return False
+                time.sleep(delay)
+                delay *= 2
+    
+    def send(self, alerts: List[Dict], dropped: int = 0):
+        """Send a batch of alerts (see NotificationDispatcher) once."""
+        raise NotImplementedError
+    
+    def close(self):
+        """Release any open connection or file."""
+    
+    @staticmethod
+    def alert_record(alert: Dict) -> Dict:
+        """Return an alert as a JSON-serializable dict."""
+        return {
+            'url': alert['url'],
+            'status': alert['status'],
+            'error_message': alert['error_message'],
+            'timestamp': alert['timestamp'].isoformat()
+        }
+
+
+class WindowsNotifier(Notifier):
+    """Windows 10/11 toast notifications, with a message box as fallback."""
+    
+    name = 'windows'
+    
+    def __init__(self, **kwargs):
+        kwargs.setdefault('retries', 0)  # The message box fallback is the retry
+        super().__init__(**kwargs)
+        self.toaster = ToastNotifier()
+    
+    def send(self, alerts: List[Dict], dropped: int = 0):
+        title, message = format_notification(alerts, dropped)
+        try:
+            # Try to send notification
+            self.toaster.show_toast(
+                title,
+                message,
+                duration=10,
+                threaded=True
+            )
+        except Exception as e:
+            # If notification fails in bundled exe, try alternative method
+            try:
+                # Try using win32api directly as fallback
+                import win32api
+                import win32con
+                win32api.MessageBox(
+                    0,
+                    message,
+                    title,
+                    win32con.MB_OK | win32con.MB_ICONWARNING
+                )
+            except:
+                # If all else fails, just log it (silent failure)
+                pass
+
+
+class WebhookNotifier(Notifier):
+    """POST each batch of alerts as JSON to an HTTP endpoint.
+    
+    The body has ``title``, ``message`` (as shown in other notifications),
+    ``alerts`` (url, status, error_message, timestamp) and ``dropped``.
+    Connections are kept alive between batches.
+    """
+    
+    name = 'webhook'
+    
+    def __init__(self, url: str, headers: Optional[Dict[str, str]] = None,
+                 timeout: float = 10.0, **kwargs):
+        super().__init__(**kwargs)
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+    
+    def send(self, alerts: List[Dict], dropped: int = 0):
+        title, message = format_notification(alerts, dropped)
+        response = self.session.post(self.url, timeout=self.timeout, json={
+            'title': title,
+            'message': message,
+            'alerts': [self.alert_record(alert) for alert in alerts],
+            'dropped': dropped
+        })
+        response.raise_for_status()
+    
+    def close(self):
+        self.session.close()
+
+
+class SMTPNotifier(Notifier):
+    """Email each batch of alerts, reusing one SMTP connection.
+    
+    ``security`` is None (plain), 'starttls' or 'ssl'. The connection is
+    checked with NOOP before each batch and reopened if the server has
+    dropped it.
+    """
+    
+    name = 'smtp'
+    
+    def __init__(self, host: str, sender: str, recipients: List[str], port: int = 25,
+                 username: Optional[str] = None, password: Optional[str] = None,
+                 security: Optional[str] = None, timeout: float = 10.0, **kwargs):
+        if security not in (None, 'starttls', 'ssl'):
+            raise ValueError(f"Unknown SMTP security: {security}")
+        super().__init__(**kwargs)
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = list(recipients)
+        self.username = username
+        self.password = password
+        self.security = security
+        self.timeout = timeout
+        self._smtp = None
+    
+    def _connection(self) -> smtplib.SMTP:
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except smtplib.SMTPException:
+                pass
+            except OSError:
+                pass
+            self.close()
+        
+        if self.security == 'ssl':
+            smtp = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.security == 'starttls':
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or '')
+        except Exception:
+            smtp.close()
+            raise
+        self._smtp = smtp
+        return smtp
+    
+    def send(self, alerts: List[Dict], dropped: int = 0):
+        title, message = format_notification(alerts, dropped)
+        email = EmailMessage()
+        email['Subject'] = f"{title}: {message.splitlines()[0]}"
+        email['From'] = self.sender
+        email['To'] = ", ".join(self.recipients)
+        details = [f"{alert['timestamp']:%Y-%m-%d %H:%M:%S}  {alert['status']:<16} {alert['url']}"
+                   + (f"  ({alert['error_message']})" if alert['error_message'] else "")
+                   for alert in alerts]
+        email.set_content(message + "\n\n" + "\n".join(details) + "\n")
+        try:
+            self._connection().send_message(email)
+        except Exception:
+            self.close()  # Reconnect on the next attempt
+            raise
+    
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                self._smtp.close()
+            self._smtp = None
+
+
+class SyslogNotifier(Notifier):
+    """Send each alert as a syslog message.
+    
+    ``address`` is a (host, port) pair for UDP syslog or the path of a
+    local syslog socket such as '/dev/log'. Failures are logged at
+    ``LOG_ERR`` and recoveries at ``LOG_NOTICE``. The socket is kept open
+    between batches.
+    """
+    
+    name = 'syslog'
+    
+    def __init__(self, address=('localhost', 514), facility: int = SysLogHandler.LOG_USER,
+                 tag: str = 'server_status_checker', **kwargs):
+        super().__init__(**kwargs)
+        self.address = address
+        self.facility = facility
+        self.tag = tag
+        self._socket = None
+    
+    def _connection(self) -> socket.socket:
+        if self._socket is None:
+            if isinstance(self.address, str):
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            else:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            try:
+                sock.connect(self.address)
+            except OSError:
+                sock.close()
+                raise
+            self._socket = sock
+        return self._socket
+    
+    def send(self, alerts: List[Dict], dropped: int = 0):
+        messages = []
+        for alert in alerts:
+            if alert['status'] == 'recovered':
+                severity, text = SysLogHandler.LOG_NOTICE, f"Server recovered: {alert['url']}"
+            else:
+                severity, text = SysLogHandler.LOG_ERR, f"Server failed: {alert['url']}"
+                text += f" ({alert['status']}"
+                text += f": {alert['error_message']})" if alert['error_message'] else ")"
+            messages.append((severity, text))
+        if dropped:
+            messages.append((SysLogHandler.LOG_WARNING, f"{dropped} alert(s) dropped"))
+        
+        try:
+            sock = self._connection()
+            for severity, text in messages:
+                priority = (self.facility << 3) | severity
+                sock.send(f"<{priority}>{self.tag}: {text}".encode('utf-8'))
+        except OSError:
+            self.close()  # Reopen the socket on the next attempt
+            raise
+    
+    def close(self):
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+
+class JSONLFileNotifier(Notifier):
+    """Append each alert as one JSON line to a file.
+    
+    The file is opened once and flushed after every batch.
+    """
+    
+    name = 'file'
+    
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = Path(path)
+        self._file = None
+    
+    def send(self, alerts: List[Dict], dropped: int = 0):
+        try:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            for alert in alerts:
+                self._file.write(json.dumps(self.alert_record(alert)) + '\n')
+            if dropped:
+                self._file.write(json.dumps({'dropped': dropped,
+                                             'timestamp': datetime.now().isoformat()}) + '\n')
+            self._file.flush()
+        except OSError:
+            self.close()
+            raise
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def parse_notifier(spec: str) -> Notifier:
+    """Create a notifier from a command line spec.
+    
+    ``webhook:<url>``, ``file:<path>``, ``syslog`` (local socket),
+    ``syslog:<host>[:<port>]`` or
+    ``smtp://[user:password@]host[:port]?from=<address>&to=<address>[,<address>]``
+    (use ``smtps://`` for SSL or add ``&starttls=1``).
+    """
+    kind, _, value = spec.partition(':')
+    if kind == 'webhook' and value:
+        return WebhookNotifier(value)
+    if kind == 'file' and value:
+        return JSONLFileNotifier(value)
+    if kind == 'syslog':
+        if not value:
+            return SyslogNotifier('/dev/log')
+        host, _, port = value.partition(':')
+        return SyslogNotifier((host, int(port or 514)))
+    if kind in ('smtp', 'smtps'):
+        parts = urlsplit(spec)
+        params = dict(parse_qsl(parts.query))
+        if not parts.hostname or 'from' not in params or 'to' not in params:
+            raise ValueError(f"SMTP notifier needs a host, from= and to=: {spec}")
+        security = 'ssl' if kind == 'smtps' else ('starttls' if params.get('starttls') else None)
+        return SMTPNotifier(parts.hostname, params['from'], params['to'].split(','),
+                            port=parts.port or (465 if kind == 'smtps' else 25),
+                            username=parts.username, password=parts.password,
+                            security=security)
+    raise ValueError(f"Unknown notifier: {spec}")
+
 
 class ServerStatusChecker:
-    def __init__(self, urls_file: str = "urls.txt", db_file: str = "status_log.db"):
+    def __init__(self, urls_file: str = "urls.txt", db_file: str = "status_log.db",
+                 max_workers: int = 20, storage_profile: str = 'default',
+                 pool_connections: int = 100, pool_maxsize: Optional[int] = None,
+                 pool_block: bool = False, keepalive_idle: float = 90.0,
+                 dns_cache_ttl: float = 300.0, dns_negative_ttl: float = 30.0,
+                 dns_cache_size: int = 1024,
+                 retention: Optional[RetentionPolicy] = None,
+                 alert_tracker: Optional[AlertTracker] = None,
+                 notifiers: Optional[List[Notifier]] = None,
+                 connect_timeout: float = 10.0, read_timeout: float = 10.0):
         self.urls_file = Path(urls_file)
         self.db_file = Path(db_file)
-        self.urls: List[str] = []
+        self.storage_profile = storage_profile
+        self.storage_info = ""
+        self.targets = TargetRegistry(self.urls_file)  # URLs and per-URL settings from urls.txt
+        self.max_workers = max(1, max_workers)  # Concurrent checks per sweep
+        self.connect_timeout = connect_timeout  # Defaults; URLs can set their own
+        self.read_timeout = read_timeout
+        self.keepalive_idle = keepalive_idle
+        
+        # Shared HTTP session; keep a pooled connection per worker for each host
         self.session = requests.Session()
-        self.session.timeout = 10  # 10 second timeout
+        self.http_adapter = PooledHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize or self.max_workers,
+            pool_block=pool_block,
+            idle_timeout=keepalive_idle
+        )
+        self.session.mount('http://', self.http_adapter)
+        self.session.mount('https://', self.http_adapter)
         
-        # Initialize database
+        # Cache host name lookups across checks
+        self.dns_cache = DNSCache(ttl=dns_cache_ttl, negative_ttl=dns_negative_ttl,
+                                  max_entries=dns_cache_size)
+        
+        # Initialize database and the background log writer
+        self.retention = retention
         self._init_database()
+        self.log_writer = StatusLogWriter(self.db_file, storage_profile=storage_profile,
+                                          retention=retention)
         
-        # Initialize Windows notifier
-        if WINDOWS_NOTIFICATIONS_AVAILABLE:
-            self.notifier = ToastNotifier()
-        else:
-            self.notifier = None
+        # Alert on UP/DOWN changes rather than on every failed check
+        self.alert_tracker = alert_tracker or AlertTracker()
+        
+        # Notification backends (Windows toasts by default), each with its own queue
+        if notifiers is None:
+            notifiers = [WindowsNotifier()] if WINDOWS_NOTIFICATIONS_AVAILABLE else []
+        self.notifiers: List[Notifier] = list(notifiers)
+        self.notification_dispatchers = [
+            NotificationDispatcher(notifier.deliver, coalesce_window=notifier.coalesce_window)
+            for notifier in self.notifiers
+        ]
         
         # Load URLs
         self.load_urls()
     
     def _init_database(self):
-        """Initialize SQLite database for logging."""
-        conn = sqlite3.connect(self.db_file)
+        """Initialize SQLite database for logging, upgrading older layouts."""
+        conn = connect_database(self.db_file, self.storage_profile)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        tables = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if version < SCHEMA_VERSION and 'status_logs' in tables:
+            self._migrate_database(conn, tables)
+        
         cursor = conn.cursor()
+        self._create_tables(cursor)
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        
+        if cursor.execute("SELECT 1 FROM current_status LIMIT 1").fetchone() is None:
+            self._backfill_current_status(cursor)
+        
+        # Remember when rollups started, so retention can fold older raw rows into them
+        cursor.execute('''
+            INSERT OR IGNORE INTO storage_meta (key, value)
+            VALUES ('rollup_since', COALESCE((SELECT MIN(bucket_start) FROM status_rollup_1m), ?))
+        ''', (datetime.now().replace(microsecond=0),))
+        
+        conn.commit()
+        
+        # Report the settings actually in effect for this database
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+        synchronous_names = {0: 'OFF', 1: 'NORMAL', 2: 'FULL', 3: 'EXTRA'}
+        self.storage_info = (f"Storage profile: {self.storage_profile} "
+                             f"(journal_mode={journal_mode.upper()}, "
+                             f"synchronous={synchronous_names.get(synchronous, synchronous)})")
+        print(self.storage_info)
+        
+        if self.retention is not None:
+            auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+            print(f"Retention: raw checks kept for {self.retention.raw_age / 86400:g} day(s)")
+            if auto_vacuum != 2:
+                print("Note: this database was created without incremental vacuum, so space "
+                      "freed by retention is reused but the file will not shrink.")
+        
+        conn.close()
+    
+    @staticmethod
+    def _create_tables(cursor: sqlite3.Cursor):
+        """Create the current (SCHEMA_VERSION) tables, indexes and views."""
+        # Dictionary tables: each URL, status and error message is stored once
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS targets (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL UNIQUE
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS statuses (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            )
+        ''')
+        cursor.executemany("INSERT OR IGNORE INTO statuses (id, name) VALUES (?, ?)",
+                           [(code, name) for name, code in STATUS_CODES.items()])
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS error_messages (
+                id INTEGER PRIMARY KEY,
+                message TEXT NOT NULL UNIQUE
+            )
+        ''')
         
         # Create table for status logs
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS status_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                url TEXT NOT NULL,
+                id INTEGER PRIMARY KEY,
+                url_id INTEGER NOT NULL REFERENCES targets(id),
                 status_code INTEGER,
                 response_time REAL,
-                status TEXT NOT NULL,
-                error_message TEXT,
-                timestamp DATETIME NOT NULL
+                status_id INTEGER NOT NULL REFERENCES statuses(id),
+                error_id INTEGER REFERENCES error_messages(id),
+                timestamp DATETIME NOT NULL,
+                ttfb REAL,
+                dns_time REAL,
+                connect_time REAL,
+                tls_time REAL,
+                connection_reused INTEGER
             )
         ''')
         
@@ -69,185 +1905,1030 @@ class ServerStatusChecker:
             CREATE INDEX IF NOT EXISTS idx_timestamp ON status_logs(timestamp)
         ''')
         
+        # Per-URL history (get_history) reads a single range of this index
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_url_timestamp ON status_logs(url_id, timestamp)
+        ''')
+        
+        # The log with URL, status and error text filled in, for ad-hoc queries
+        cursor.execute('''
+            CREATE VIEW IF NOT EXISTS status_logs_view AS
+            SELECT l.id, t.url, l.status_code, l.response_time, s.name AS status,
+                   e.message AS error_message, l.timestamp, l.ttfb, l.dns_time,
+                   l.connect_time, l.tls_time, l.connection_reused
+            FROM status_logs l
+            JOIN targets t ON t.id = l.url_id
+            JOIN statuses s ON s.id = l.status_id
+            LEFT JOIN error_messages e ON e.id = l.error_id
+        ''')
+        
+        # Latest check of each URL, kept up to date by the log writer
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS current_status (
+                url_id INTEGER PRIMARY KEY REFERENCES targets(id),
+                status_id INTEGER NOT NULL REFERENCES statuses(id),
+                status_code INTEGER,
+                response_time REAL,
+                error_id INTEGER REFERENCES error_messages(id),
+                last_checked DATETIME NOT NULL,
+                since DATETIME NOT NULL,
+                consecutive_failures INTEGER NOT NULL
+            )
+        ''')
+        
+        # Key/value settings kept with the data
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS storage_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
+        
+        # Create per-URL rollup tables (see ROLLUP_RESOLUTIONS)
+        for resolution in ROLLUP_RESOLUTIONS:
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS status_rollup_{resolution} (
+                    url_id INTEGER NOT NULL REFERENCES targets(id),
+                    bucket_start DATETIME NOT NULL,
+                    count INTEGER NOT NULL,
+                    success_count INTEGER NOT NULL,
+                    latency_count INTEGER NOT NULL,
+                    latency_min REAL,
+                    latency_avg REAL,
+                    latency_max REAL,
+                    latency_sum REAL NOT NULL,
+                    latency_p50 REAL,
+                    latency_p95 REAL,
+                    latency_p99 REAL,
+                    histogram TEXT NOT NULL,
+                    PRIMARY KEY (url_id, bucket_start)
+                ) WITHOUT ROWID
+            ''')
+            cursor.execute(f'''
+                CREATE INDEX IF NOT EXISTS idx_rollup_{resolution}_bucket
+                ON status_rollup_{resolution}(bucket_start)
+            ''')
+    
+    @staticmethod
+    def _backfill_current_status(cursor: sqlite3.Cursor):
+        """Fill current_status from the log of a database that predates it."""
+        cursor.execute('''
+            INSERT INTO current_status
+            (url_id, status_id, status_code, response_time, error_id, last_checked, since,
+             consecutive_failures)
+            SELECT l.url_id, l.status_id, l.status_code, l.response_time, l.error_id,
+                   l.timestamp,
+                   (SELECT MIN(timestamp) FROM status_logs
+                    WHERE url_id = l.url_id AND timestamp > COALESCE(
+                        (SELECT MAX(timestamp) FROM status_logs
+                         WHERE url_id = l.url_id AND status_id != l.status_id), '')),
+                   CASE WHEN l.status_id = ? THEN 0 ELSE
+                       (SELECT COUNT(*) FROM status_logs
+                        WHERE url_id = l.url_id AND timestamp > COALESCE(
+                            (SELECT MAX(timestamp) FROM status_logs
+                             WHERE url_id = l.url_id AND status_id = ?), ''))
+                   END
+            FROM targets t
+            JOIN status_logs l ON l.id = (
+                SELECT id FROM status_logs WHERE url_id = t.id
+                ORDER BY timestamp DESC, id DESC LIMIT 1
+            )
+        ''', (STATUS_CODES['success'], STATUS_CODES['success']))
+    
+    def _migrate_database(self, conn: sqlite3.Connection, tables: set):
+        """Convert a version 1 database (URL and status text on every row) in place."""
+        print(f"Upgrading {self.db_file} to schema version {SCHEMA_VERSION}. "
+              f"This may take a while for large databases...")
+        
+        # Bring the old table up to its final version 1 layout first
+        existing_columns = {row[1] for row in conn.execute("PRAGMA table_info(status_logs)")}
+        for column, column_type in (('ttfb', 'REAL'), ('dns_time', 'REAL'),
+                                    ('connect_time', 'REAL'), ('tls_time', 'REAL'),
+                                    ('connection_reused', 'INTEGER')):
+            if column not in existing_columns:
+                conn.execute(f"ALTER TABLE status_logs ADD COLUMN {column} {column_type}")
         conn.commit()
-        conn.close()
+        
+        rollup_tables = [f"status_rollup_{resolution}" for resolution in ROLLUP_RESOLUTIONS
+                         if f"status_rollup_{resolution}" in tables]
+        isolation_level = conn.isolation_level
+        conn.isolation_level = None  # Manage the transaction explicitly
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            
+            # Move the old tables aside; their index names would clash
+            conn.execute("ALTER TABLE status_logs RENAME TO status_logs_v1")
+            conn.execute("DROP INDEX IF EXISTS idx_timestamp")
+            for table in rollup_tables:
+                conn.execute(f"ALTER TABLE {table} RENAME TO {table}_v1")
+                conn.execute(f"DROP INDEX IF EXISTS idx_rollup_{table[len('status_rollup_'):]}_bucket")
+            self._create_tables(conn.cursor())
+            
+            conn.execute("INSERT OR IGNORE INTO targets (url) SELECT DISTINCT url FROM status_logs_v1")
+            conn.execute('''
+                INSERT OR IGNORE INTO error_messages (message)
+                SELECT DISTINCT error_message FROM status_logs_v1 WHERE error_message IS NOT NULL
+            ''')
+            conn.execute('''
+                INSERT INTO status_logs
+                (id, url_id, status_code, response_time, status_id, error_id, timestamp,
+                 ttfb, dns_time, connect_time, tls_time, connection_reused)
+                SELECT l.id, t.id, l.status_code, l.response_time, COALESCE(s.id, 0), e.id,
+                       l.timestamp, l.ttfb, l.dns_time, l.connect_time, l.tls_time,
+                       l.connection_reused
+                FROM status_logs_v1 l
+                JOIN targets t ON t.url = l.url
+                LEFT JOIN statuses s ON s.name = l.status
+                LEFT JOIN error_messages e ON e.message = l.error_message
+                ORDER BY l.id
+            ''')
+            conn.execute("DROP TABLE status_logs_v1")
+            
+            for table in rollup_tables:
+                conn.execute(f"INSERT OR IGNORE INTO targets (url) SELECT DISTINCT url FROM {table}_v1")
+                conn.execute(f'''
+                    INSERT INTO {table}
+                    SELECT t.id, r.bucket_start, r.count, r.success_count, r.latency_count,
+                           r.latency_min, r.latency_avg, r.latency_max, r.latency_sum,
+                           r.latency_p50, r.latency_p95, r.latency_p99, r.histogram
+                    FROM {table}_v1 r JOIN targets t ON t.url = r.url
+                ''')
+                conn.execute(f"DROP TABLE {table}_v1")
+            
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.isolation_level = isolation_level
+        
+        # Rewrite the file so the space saved is returned (this also
+        # enables incremental vacuum for retention)
+        conn.execute("VACUUM")
+        print("Upgrade complete.")
+    
+    @property
+    def urls(self) -> Tuple[str, ...]:
+        """Snapshot of the monitored URLs; safe to iterate while URLs are edited."""
+        return self.targets.snapshot().urls
+    
+    @property
+    def url_options(self) -> Mapping[str, Mapping[str, str]]:
+        """Per-URL settings from urls.txt, keyed by URL."""
+        return self.targets.snapshot().options
     
     def load_urls(self):
-        """Load URLs from urls.txt file."""
-        if self.urls_file.exists():
-            with open(self.urls_file, 'r', encoding='utf-8') as f:
-                self.urls = [line.strip() for line in f if line.strip()]
+        """Load URLs (and any per-URL options) from urls.txt file."""
+        if self.targets.load():
             print(f"Loaded {len(self.urls)} URL(s) from {self.urls_file}")
         else:
             print(f"No {self.urls_file} file found. Please add URLs first.")
     
+    @staticmethod
+    def _with_scheme(url: str) -> str:
+        """Add https:// to a URL that has no scheme."""
+        if not url.lower().startswith(('http://', 'https://')):
+            url = 'https://' + url
+        return url
+    
     def add_url(self, url: str):
-        """Add a URL to the list and save to file."""
-        url = url.strip()
+        """Add a URL to the list; urls.txt is saved in the background.
+        
+        Options may follow the URL, e.g. ``example.com interval=10s``.
+        """
+        url, options = parse_target_line(url.strip())
         if not url:
             return False
         
-        # Add http:// if no scheme is provided
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url
-        
-        if url not in self.urls:
-            self.urls.append(url)
-            self.save_urls()
+        url = self._with_scheme(url)
+        if self.targets.add(url, options):
             print(f"Added URL: {url}")
             return True
         else:
             print(f"URL already exists: {url}")
             return False
     
-    def save_urls(self):
-        """Save URLs to urls.txt file."""
-        with open(self.urls_file, 'w', encoding='utf-8') as f:
-            for url in self.urls:
-                f.write(url + '\n')
+    def add_urls(self, targets: Iterable[Tuple[str, Mapping[str, str]]]) -> List[str]:
+        """Add many (url, options) pairs at once; return the URLs that were new."""
+        added = self.targets.add_many((self._with_scheme(url), options)
+                                      for url, options in targets)
+        print(f"Added {len(added)} URL(s)")
+        return added
     
-    def check_url(self, url: str) -> Dict:
-        """Check a single URL and return status information."""
-        start_time = time.time()
-        result = {
+    def import_urls(self, path) -> List[str]:
+        """Add every URL listed in a file in urls.txt format ('-' reads standard input)."""
+        if str(path) == '-':
+            targets = parse_target_lines(sys.stdin, "standard input")
+        else:
+            targets = read_target_file(path)
+        added = self.add_urls(targets)
+        if len(added) < len(targets):
+            print(f"Skipped {len(targets) - len(added)} URL(s) already monitored")
+        return added
+    
+    def remove_url(self, url: str) -> bool:
+        """Remove a URL from the list; urls.txt is saved in the background."""
+        return bool(self.remove_urls([url]))
+    
+    def remove_urls(self, urls: Iterable[str]) -> List[str]:
+        """Remove many URLs at once; return the URLs that were removed."""
+        removed = self.targets.remove_many(urls)
+        for url in removed:
+            self.alert_tracker.forget(url)
+        return removed
+    
+    def save_urls(self) -> bool:
+        """Write any pending URL edits to urls.txt now."""
+        return self.targets.flush()
+    
+    def get_interval(self, url: str, default: float) -> float:
+        """Return the check interval for a URL in seconds."""
+        value = self.url_options.get(url, {}).get('interval')
+        if value is None:
+            return default
+        try:
+            return parse_duration(value)
+        except ValueError:
+            return default
+    
+    def get_probe_method(self, url: str) -> str:
+        """Return the probe method for a URL (see PROBE_METHODS)."""
+        method = self.url_options.get(url, {}).get('method', 'get').lower()
+        return method if method in PROBE_METHODS else 'get'
+    
+    def get_timeouts(self, url: str) -> Tuple[float, float]:
+        """Return the (connect, read) timeouts for a URL in seconds.
+        
+        The ``timeout`` option sets both; ``connect_timeout`` and
+        ``read_timeout`` override one of them.
+        """
+        options = self.url_options.get(url, {})
+        timeouts = []
+        for name, default in (('connect_timeout', self.connect_timeout),
+                              ('read_timeout', self.read_timeout)):
+            value = options.get(name, options.get('timeout'))
+            try:
+                timeouts.append(parse_duration(value) if value is not None else default)
+            except ValueError:
+                timeouts.append(default)
+        return timeouts[0], timeouts[1]
+    
+    @staticmethod
+    def timeout_message(connect_timeout: float, read_timeout: float,
+                        connecting: bool) -> str:
+        """Return the error message for a probe that timed out."""
+        if connecting:
+            return f"Connect timeout ({connect_timeout:g}s)"
+        return f"Request timeout ({read_timeout:g}s)"
+    
+    @staticmethod
+    def _new_result(url: str) -> Dict:
+        """Return a result for ``url`` with every field unset and status 'unknown'."""
+        return {
             'url': url,
             'status_code': None,
             'response_time': None,
+            'ttfb': None,
+            'dns_time': None,
+            'connect_time': None,
+            'tls_time': None,
+            'connection_reused': None,
             'status': 'unknown',
             'error_message': None,
             'timestamp': datetime.now()
         }
+    
+    @classmethod
+    def skipped_result(cls, url: str, reason: str) -> Dict:
+        """Return the result of a check that was skipped without probing ``url``."""
+        result = cls._new_result(url)
+        result['status'] = 'skipped'
+        result['error_message'] = reason
+        return result
+    
+    def check_url(self, url: str) -> Dict:
+        """Check a single URL and return status information.
+        
+        ``response_time`` is the total time for the probe and ``ttfb`` the
+        time until the response headers arrived. When a new connection was
+        opened, ``dns_time``, ``connect_time`` and ``tls_time`` break down
+        how long it took; ``connection_reused`` is true when a pooled
+        connection was used instead. All times come from a monotonic clock.
+        """
+        method = self.get_probe_method(url)
+        timeout = self.get_timeouts(url)
+        result = self._new_result(url)
+        phases: Dict[str, float] = {}
+        _probe_context.phases = phases
+        _probe_context.resolver = self.dns_cache.resolve
+        start_time = time.perf_counter()
         
         try:
-            response = self.session.get(url, timeout=10)
-            response_time = time.time() - start_time
+            if method == 'head':
+                response = self.session.head(url, timeout=timeout, allow_redirects=True)
+                ttfb = time.perf_counter() - start_time
+            else:
+                headers = {'Range': 'bytes=0-0'} if method == 'range' else None
+                # stream=True returns as soon as the headers have arrived
+                response = self.session.get(url, timeout=timeout, headers=headers, stream=True)
+                ttfb = time.perf_counter() - start_time
+                if method == 'get' or (method == 'range' and response.status_code == 206):
+                    response.content  # Read the (possibly one-byte) body
+                response.close()
+            response_time = time.perf_counter() - start_time
             
             result['status_code'] = response.status_code
             result['response_time'] = round(response_time, 3)
+            result['ttfb'] = round(ttfb, 3)
+            result['connection_reused'] = 'connect' not in phases
             
-            if response.status_code == 200:
+            if response.status_code == 200 or (method == 'range' and response.status_code == 206):
                 result['status'] = 'success'
             else:
                 result['status'] = 'failed'
                 result['error_message'] = f"HTTP {response.status_code}"
                 
-        except requests.exceptions.Timeout:
+        except requests.exceptions.Timeout as e:
             result['status'] = 'timeout'
-            result['error_message'] = 'Request timeout (10s)'
-            result['response_time'] = round(time.time() - start_time, 3)
+            result['error_message'] = self.timeout_message(
+                *timeout, isinstance(e, requests.exceptions.ConnectTimeout))
+            result['response_time'] = round(time.perf_counter() - start_time, 3)
             
         except requests.exceptions.ConnectionError:
             result['status'] = 'connection_error'
             result['error_message'] = 'Connection failed'
-            result['response_time'] = round(time.time() - start_time, 3)
+            result['response_time'] = round(time.perf_counter() - start_time, 3)
             
         except requests.exceptions.RequestException as e:
             result['status'] = 'error'
             result['error_message'] = str(e)
-            result['response_time'] = round(time.time() - start_time, 3)
+            result['response_time'] = round(time.perf_counter() - start_time, 3)
+        
+        finally:
+            _probe_context.phases = None
+            _probe_context.resolver = None
+        
+        for phase in ('dns', 'connect', 'tls'):
+            if phase in phases:
+                result[f'{phase}_time'] = round(phases[phase], 3)
         
         return result
     
     def log_status(self, result: Dict):
-        """Log status check result to database."""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
+        """Queue a status check result for the database writer."""
+        self.log_writer.put(result)
+    
+    def flush_logs(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all queued results have been written to the database."""
+        return self.log_writer.flush(timeout)
+    
+    def close(self):
+        """Flush pending logs, URL edits and alerts, then release background threads and the HTTP session."""
+        self.log_writer.close()
+        self.targets.close()
+        for dispatcher in self.notification_dispatchers:
+            dispatcher.close()
+        for notifier in self.notifiers:
+            notifier.close()
+        self.session.close()
+    
+    def get_rollups(self, url: str, resolution: str = '1h',
+                    since: Optional[datetime] = None,
+                    until: Optional[datetime] = None) -> List[Dict]:
+        """Return rollup buckets for a URL, oldest first.
         
-        cursor.execute('''
-            INSERT INTO status_logs 
-            (url, status_code, response_time, status, error_message, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            result['url'],
-            result['status_code'],
-            result['response_time'],
-            result['status'],
-            result['error_message'],
-            result['timestamp']
-        ))
+        ``resolution`` is one of ROLLUP_RESOLUTIONS ('1m', '1h' or '1d').
+        Each bucket has the check count, success count, uptime percentage
+        and latency min/avg/max/p50/p95/p99 in seconds.
+        """
+        if resolution not in ROLLUP_RESOLUTIONS:
+            raise ValueError(f"Unknown rollup resolution: {resolution}")
+        self.flush_logs()
         
-        conn.commit()
-        conn.close()
+        query = f'''
+            SELECT bucket_start, count, success_count, latency_min, latency_avg,
+                   latency_max, latency_p50, latency_p95, latency_p99
+            FROM status_rollup_{resolution}
+            WHERE url_id = (SELECT id FROM targets WHERE url = ?)
+              AND bucket_start >= ? AND bucket_start < ?
+            ORDER BY bucket_start
+        '''
+        since = rollup_bucket_start(since, resolution) if since else datetime.min
+        until = until or datetime.max
+        conn = connect_database(self.db_file, self.storage_profile)
+        try:
+            rows = conn.execute(query, (url, since, until)).fetchall()
+        finally:
+            conn.close()
+        
+        columns = ('bucket_start', 'count', 'success_count', 'latency_min', 'latency_avg',
+                   'latency_max', 'latency_p50', 'latency_p95', 'latency_p99')
+        buckets = []
+        for row in rows:
+            bucket = dict(zip(columns, row))
+            bucket['uptime'] = round(100.0 * bucket['success_count'] / bucket['count'], 2)
+            buckets.append(bucket)
+        return buckets
+    
+    def get_history(self, url: str, since: Optional[datetime] = None,
+                    until: Optional[datetime] = None, limit: int = 100,
+                    cursor: Optional[Tuple[str, int]] = None) -> Dict:
+        """Return logged checks for a URL, newest first, one page at a time.
+        
+        Returns ``{'checks': [...], 'next_cursor': ...}``. Pass
+        ``next_cursor`` back as ``cursor`` to get the next (older) page;
+        it is None once there are no more checks. Paging continues where
+        the previous page ended, so it stays fast however deep you go.
+        """
+        self.flush_logs()
+        
+        params = [url, since or datetime.min, until or datetime.max]
+        after_cursor = ''
+        if cursor is not None:
+            after_cursor = 'AND (l.timestamp, l.id) < (?, ?)'
+            params.extend(cursor)
+        params.append(limit)
+        query = f'''
+            SELECT l.id, l.timestamp, s.name, l.status_code, l.response_time, l.ttfb,
+                   l.dns_time, l.connect_time, l.tls_time, l.connection_reused, e.message
+            FROM status_logs l
+            JOIN statuses s ON s.id = l.status_id
+            LEFT JOIN error_messages e ON e.id = l.error_id
+            WHERE l.url_id = (SELECT id FROM targets WHERE url = ?)
+              AND l.timestamp >= ? AND l.timestamp < ?
+              {after_cursor}
+            ORDER BY l.timestamp DESC, l.id DESC
+            LIMIT ?
+        '''
+        conn = connect_database(self.db_file, self.storage_profile)
+        try:
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+        
+        columns = ('id', 'timestamp', 'status', 'status_code', 'response_time', 'ttfb',
+                   'dns_time', 'connect_time', 'tls_time', 'connection_reused',
+                   'error_message')
+        checks = [dict(zip(columns, row)) for row in rows]
+        next_cursor = None
+        if len(checks) == limit:
+            next_cursor = (checks[-1]['timestamp'], checks[-1]['id'])
+        return {'checks': checks, 'next_cursor': next_cursor}
+    
+    def get_current_status(self) -> Dict[str, Dict]:
+        """Return the latest check of every URL that has been checked, keyed by URL.
+        
+        Each entry has the status, status code, response time, error
+        message, when it was last checked, since when it has had this
+        status and the number of consecutive failed checks.
+        """
+        self.flush_logs()
+        
+        conn = connect_database(self.db_file, self.storage_profile)
+        try:
+            rows = conn.execute('''
+                SELECT t.url, s.name, c.status_code, c.response_time, e.message,
+                       c.last_checked, c.since, c.consecutive_failures
+                FROM current_status c
+                JOIN targets t ON t.id = c.url_id
+                JOIN statuses s ON s.id = c.status_id
+                LEFT JOIN error_messages e ON e.id = c.error_id
+            ''').fetchall()
+        finally:
+            conn.close()
+        
+        columns = ('status', 'status_code', 'response_time', 'error_message', 'last_checked',
+                   'since', 'consecutive_failures')
+        return {row[0]: dict(zip(columns, row[1:])) for row in rows}
+    
+    def get_uptimes(self, since: Optional[datetime] = None) -> Dict[str, float]:
+        """Return the uptime percentage of every checked URL since ``since``.
+        
+        Defaults to the last 24 hours. Read from the hourly rollups, so
+        ``since`` is rounded down to the hour.
+        """
+        since = since or datetime.now() - timedelta(days=1)
+        self.flush_logs()
+        
+        conn = connect_database(self.db_file, self.storage_profile)
+        try:
+            # Aggregate first, grouping on +url_id so SQLite reads only the
+            # recent buckets through idx_rollup_1h_bucket rather than walking
+            # the whole table in primary key order
+            rows = conn.execute('''
+                SELECT t.url, r.successes, r.checks
+                FROM (
+                    SELECT url_id, SUM(success_count) AS successes, SUM(count) AS checks
+                    FROM status_rollup_1h
+                    WHERE bucket_start >= ?
+                    GROUP BY +url_id
+                ) r JOIN targets t ON t.id = r.url_id
+            ''', (rollup_bucket_start(since, '1h'),)).fetchall()
+        finally:
+            conn.close()
+        return {url: round(100.0 * successes / count, 2) for url, successes, count in rows if count}
+    
+    def pool_stats(self) -> Dict:
+        """Return connection pool reuse counters (hits, misses, hit ratio)."""
+        return self.http_adapter.pool_stats()
+    
+    def dns_stats(self) -> Dict:
+        """Return DNS cache counters (hits, misses, hit ratio, time saved)."""
+        return self.dns_cache.stats()
     
     def send_notification(self, url: str, status: str, error_message: Optional[str] = None):
-        """Send Windows notification for failed checks."""
-        if not self.notifier:
+        """Queue a notification for a server going down or recovering.
+        
+        Every configured notifier gets it. Delivery happens on each
+        notifier's dispatcher thread, so a blocking fallback dialog or a
+        slow webhook never stalls the checks.
+        """
+        if status in FAILURE_STATUSES or status == 'recovered':
+            for dispatcher in self.notification_dispatchers:
+                dispatcher.notify(url, status, error_message)
+    
+    def record_result(self, result: Dict):
+        """Log a check result and notify if it changed the URL's state.
+        
+        Adds the URL's state after this check (see AlertTracker) to the
+        result as ``'state'``. A notification is sent when a URL goes
+        DOWN and when it comes back UP from DOWN.
+        """
+        self.log_status(result)
+        if result['status'] == 'skipped':
+            result['state'] = self.alert_tracker.state(result['url'])
             return
         
-        title = "Server Status Alert"
-        if status in ['timeout', 'connection_error', 'error', 'failed']:
-            message = f"Server failed: {url}"
-            if error_message:
-                message += f"\nError: {error_message}"
-            
-            try:
-                # Try to send notification
-                self.notifier.show_toast(
-                    title,
-                    message,
-                    duration=10,
-                    threaded=True
-                )
-            except Exception as e:
-                # If notification fails in bundled exe, try alternative method
+        change = self.alert_tracker.update(result['url'], result['status'] == 'success')
+        result['state'] = self.alert_tracker.state(result['url'])
+        if change is None:
+            return
+        old_state, new_state = change
+        if new_state == AlertTracker.DOWN:
+            self.send_notification(
+                result['url'],
+                result['status'],
+                result['error_message']
+            )
+        elif old_state == AlertTracker.DOWN and new_state == AlertTracker.UP:
+            self.send_notification(result['url'], 'recovered')
+    
+    def check_urls(self, urls: List[str],
+                   on_result: Optional[Callable[[Dict], None]] = None,
+                   deadline: Optional[float] = None) -> List[Dict]:
+        """Check URLs concurrently and record each result.
+        
+        Up to ``max_workers`` checks run at once. Results are recorded and
+        passed to ``on_result`` in the same order as ``urls``. If the sweep
+        takes longer than ``deadline`` seconds, checks that have not
+        finished are abandoned and recorded with status 'skipped'.
+        """
+        urls = list(urls)
+        if not urls:
+            return []
+        
+        self.http_adapter.reap_idle_connections()
+        results = []
+        workers = min(self.max_workers, len(urls))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="status-check")
+        ends_at = None if deadline is None else time.monotonic() + deadline
+        try:
+            futures = [executor.submit(self.check_url, url) for url in urls]
+            for url, future in zip(urls, futures):
                 try:
-                    # Try using win32api directly as fallback
-                    import win32api
-                    import win32con
-                    win32api.MessageBox(
-                        0,
-                        message,
-                        title,
-                        win32con.MB_OK | win32con.MB_ICONWARNING
-                    )
-                except:
-                    # If all else fails, just log it (silent failure)
-                    pass
-    
-    def check_all_urls(self):
-        """Check all URLs and log results."""
-        if not self.urls:
-            print("No URLs to check. Please add URLs first.")
+                    timeout = None if ends_at is None else max(0.0, ends_at - time.monotonic())
+                    result = future.result(timeout=timeout)
+                except FutureTimeoutError:
+                    future.cancel()
+                    result = self.skipped_result(url, f"Sweep deadline ({deadline:g}s) reached")
+                self.record_result(result)
+                if on_result:
+                    on_result(result)
+                results.append(result)
+        finally:
+            # Probes still running after the deadline finish on their own
+            executor.shutdown(wait=ends_at is None, cancel_futures=True)
+        return results
+    
+    def print_result(self, result: Dict):
+        """Print a check result to the console."""
+        status_icon = {'success': "✓", 'skipped': "-"}.get(result['status'], "✗")
+        lines = [
+            f"  {status_icon} {result['url']}",
+            f"    Status: {result['status']} | "
+            f"Code: {result['status_code'] or 'N/A'} | "
+            f"Time: {result['response_time'] or 'N/A'}s"
+            + (f" (TTFB: {result['ttfb']}s)" if result.get('ttfb') is not None else "")
+        ]
+        if result['error_message']:
+            lines.append(f"    Error: {result['error_message']}")
+        print("\n".join(lines))
+    
+    def print_current_status(self):
+        """Print the latest known status of every monitored URL."""
+        current = self.get_current_status()
+        urls = self.urls
+        if not urls:
+            print("No URLs added yet.")
             return
+        for url in urls:
+            entry = current.get(url)
+            if entry is None:
+                print(f"  ? {url}\n    Not checked yet")
+                continue
+            status_icon = "✓" if entry['status'] == 'success' else "✗"
+            line = (f"    Status: {entry['status']} since {str(entry['since'])[:19]} | "
+                    f"Code: {entry['status_code'] or 'N/A'} | "
+                    f"Time: {entry['response_time'] or 'N/A'}s")
+            if entry['consecutive_failures']:
+                line += f" | Failed checks in a row: {entry['consecutive_failures']}"
+            print(f"  {status_icon} {url}\n{line}")
+    
+    def check_all_urls(self, deadline: Optional[float] = None) -> List[Dict]:
+        """Check all URLs and log results, giving up after ``deadline`` seconds."""
+        urls = self.urls  # Edits made during the sweep apply to the next one
+        if not urls:
+            print("No URLs to check. Please add URLs first.")
+            return []
+        
+        print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Checking {len(urls)} URL(s)...")
+        
+        return self.check_urls(urls, on_result=self.print_result, deadline=deadline)
+    
+    def run_scheduled(self, interval_seconds: float,
+                      on_result: Optional[Callable[[Dict], None]] = None,
+                      stop_event: Optional[threading.Event] = None,
+                      spread: bool = False, jitter: float = 0.0,
+                      backoff_cap: Optional[float] = None):
+        """Check each URL whenever it comes due until ``stop_event`` is set.
+        
+        URLs use their own ``interval`` option, falling back to
+        ``interval_seconds``. Probes run on a pool of ``max_workers``
+        threads; a URL whose previous probe is still running skips a slot.
+        A probe that could not start before its next slot was due is
+        recorded as 'skipped' instead of running late. ``spread``,
+        ``jitter`` and ``backoff_cap`` are passed to ``CheckScheduler``.
+        """
+        stop_event = stop_event or threading.Event()
+        scheduler = CheckScheduler(interval_seconds, self.get_interval,
+                                   spread=spread, jitter=jitter, backoff_cap=backoff_cap)
+        in_flight = set()
+        in_flight_lock = threading.Lock()
+        outcomes = queue.SimpleQueue()  # (url, success) for the scheduler's backoff
+        synced_version = None  # Target registry version the scheduler has seen
+        
+        def probe(url: str, start_by: float):
+            try:
+                if time.monotonic() > start_by:
+                    result = self.skipped_result(url, "Check could not start before its next slot")
+                else:
+                    result = self.check_url(url)
+                    outcomes.put((url, result['status'] == 'success'))
+                self.record_result(result)
+                if on_result:
+                    on_result(result)
+            except Exception as e:
+                print(f"Error checking {url}: {e}")
+            finally:
+                with in_flight_lock:
+                    in_flight.discard(url)
+        
+        executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                      thread_name_prefix="status-check")
+        next_reap = time.monotonic() + self.keepalive_idle
+        try:
+            while not stop_event.is_set():
+                if time.monotonic() >= next_reap:
+                    self.http_adapter.reap_idle_connections()
+                    next_reap = time.monotonic() + min(self.keepalive_idle, 30)
+                targets = self.targets.snapshot()
+                if targets.version != synced_version:
+                    scheduler.sync(targets.urls)
+                    synced_version = targets.version
+                while not outcomes.empty():
+                    scheduler.record_result(*outcomes.get())
+                for url, slot in scheduler.pop_due():
+                    with in_flight_lock:
+                        if url in in_flight:
+                            continue
+                        in_flight.add(url)
+                    executor.submit(probe, url, slot + scheduler.effective_interval(url))
+                
+                # Wake at least once a second to pick up URL list changes
+                wait = scheduler.time_until_next()
+                stop_event.wait(1.0 if wait is None else min(wait, 1.0))
+        finally:
+            stop_event.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def run_continuous(self, interval_minutes: int = 1, spread: bool = False,
+                       jitter: float = 0.0, backoff_cap: Optional[float] = None):
+        """Run continuous monitoring with specified interval.
+        
+        With ``spread`` each URL's checks are staggered across its interval
+        instead of all starting together; ``jitter`` adds a random delay of
+        up to that fraction of the interval to each check. With
+        ``backoff_cap`` (seconds) URLs that keep failing are checked less
+        often, down to once per ``backoff_cap``.
+        """
+        print(f"\nStarting continuous monitoring (checking every {interval_minutes} minute(s) "
+              f"unless a URL sets its own interval)...")
+        if spread or jitter:
+            print(f"Spreading checks across each interval (jitter: {jitter:.0%})")
+        if backoff_cap:
+            print(f"Backing off failing URLs to at most one check every {backoff_cap:g}s")
+        print("Press Ctrl+C to stop.\n")
+        
+        def show(result: Dict):
+            print(f"[{result['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}]")
+            self.print_result(result)
+        
+        try:
+            self._monitor(interval_minutes * 60, show, spread, jitter, backoff_cap)
+        except KeyboardInterrupt:
+            print("\n\nMonitoring stopped by user.")
+    
+    def _monitor(self, interval_seconds: float, on_result: Callable[[Dict], None],
+                 spread: bool, jitter: float, backoff_cap: Optional[float]):
+        """Run the scheduler for run_continuous until interrupted."""
+        self.run_scheduled(interval_seconds, on_result=on_result,
+                           spread=spread, jitter=jitter, backoff_cap=backoff_cap)
+
+
+class AsyncServerStatusChecker(ServerStatusChecker):
+    """Checker backend that runs all probes on a single asyncio event loop.
+    
+    Thousands of checks can be in flight at once without a thread each.
+    ``max_concurrency`` caps the number of probes in flight and
+    ``limit_per_host`` caps open connections to any single host.
+    """
+    
+    def __init__(self, urls_file: str = "urls.txt", db_file: str = "status_log.db",
+                 max_concurrency: int = 1000, limit_per_host: int = 10,
+                 storage_profile: str = 'default', keepalive_idle: float = 90.0,
+                 dns_cache_ttl: float = 300.0, dns_negative_ttl: float = 30.0,
+                 dns_cache_size: int = 1024,
+                 retention: Optional[RetentionPolicy] = None,
+                 alert_tracker: Optional[AlertTracker] = None,
+                 notifiers: Optional[List[Notifier]] = None,
+                 connect_timeout: float = 10.0, read_timeout: float = 10.0):
+        if not AIOHTTP_AVAILABLE:
+            raise RuntimeError("aiohttp is required for the asyncio backend. "
+                               "Install it with: pip install aiohttp")
+        super().__init__(urls_file, db_file, storage_profile=storage_profile,
+                         keepalive_idle=keepalive_idle, dns_cache_ttl=dns_cache_ttl,
+                         dns_negative_ttl=dns_negative_ttl, dns_cache_size=dns_cache_size,
+                         retention=retention, alert_tracker=alert_tracker,
+                         notifiers=notifiers, connect_timeout=connect_timeout,
+                         read_timeout=read_timeout)
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit_per_host = max(0, limit_per_host)  # 0 = no per-host limit
+        self._client = None
+    
+    async def _get_client(self):
+        """Return the shared aiohttp session, creating it on the running loop."""
+        if self._client is None or self._client.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_idle,
+                resolver=CachedAsyncResolver(self.dns_cache),
+                use_dns_cache=False  # Cached by self.dns_cache instead
+            )
+            self._client = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(sock_connect=self.connect_timeout,
+                                              sock_read=self.read_timeout),
+                trace_configs=[self._phase_trace_config()]
+            )
+        return self._client
+    
+    @staticmethod
+    def _phase_trace_config():
+        """Trace hooks that record DNS and connection times per request.
+        
+        aiohttp reports connection setup as a single step, so TLS handshake
+        time is included in ``connect`` rather than recorded on its own.
+        """
+        def phases_of(context) -> Dict[str, float]:
+            return context.trace_request_ctx if isinstance(context.trace_request_ctx, dict) else {}
+        
+        async def dns_start(session, context, params):
+            context.dns_start = time.perf_counter()
         
-        print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Checking {len(self.urls)} URL(s)...")
+        async def dns_end(session, context, params):
+            phases = phases_of(context)
+            phases['dns'] = phases.get('dns', 0.0) + time.perf_counter() - context.dns_start
+        
+        async def connect_start(session, context, params):
+            context.connect_start = time.perf_counter()
+            context.dns_before = phases_of(context).get('dns', 0.0)
+        
+        async def connect_end(session, context, params):
+            phases = phases_of(context)
+            dns = phases.get('dns', 0.0) - context.dns_before
+            elapsed = time.perf_counter() - context.connect_start - dns
+            phases['connect'] = phases.get('connect', 0.0) + max(0.0, elapsed)
+        
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_dns_resolvehost_start.append(dns_start)
+        trace_config.on_dns_resolvehost_end.append(dns_end)
+        trace_config.on_connection_create_start.append(connect_start)
+        trace_config.on_connection_create_end.append(connect_end)
+        return trace_config
+    
+    async def aclose(self):
+        """Close the shared aiohttp session."""
+        if self._client is not None and not self._client.closed:
+            await self._client.close()
+        self._client = None
+    
+    async def check_url(self, url: str) -> Dict:
+        """Check a single URL and return status information."""
+        client = await self._get_client()
+        method = self.get_probe_method(url)
+        connect_timeout, read_timeout = self.get_timeouts(url)
+        timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        result = self._new_result(url)
+        phases: Dict[str, float] = {}
+        start_time = time.perf_counter()
         
-        for url in self.urls:
-            result = self.check_url(url)
-            self.log_status(result)
+        try:
+            if method == 'head':
+                request = client.head(url, allow_redirects=True, timeout=timeout,
+                                      trace_request_ctx=phases)
+            else:
+                headers = {'Range': 'bytes=0-0'} if method == 'range' else None
+                request = client.get(url, headers=headers, timeout=timeout,
+                                     trace_request_ctx=phases)
             
-            # Print status
-            status_icon = "✓" if result['status'] == 'success' else "✗"
-            print(f"  {status_icon} {url}")
-            print(f"    Status: {result['status']} | "
-                  f"Code: {result['status_code'] or 'N/A'} | "
-                  f"Time: {result['response_time'] or 'N/A'}s")
+            # The response context is entered as soon as the headers arrive
+            async with request as response:
+                ttfb = time.perf_counter() - start_time
+                if method == 'get' or (method == 'range' and response.status == 206):
+                    await response.read()
+                elif method != 'head':
+                    response.close()
+            response_time = time.perf_counter() - start_time
             
-            if result['error_message']:
-                print(f"    Error: {result['error_message']}")
+            result['status_code'] = response.status
+            result['response_time'] = round(response_time, 3)
+            result['ttfb'] = round(ttfb, 3)
+            result['connection_reused'] = 'connect' not in phases
             
-            # Send notification if failed
-            if result['status'] != 'success':
-                self.send_notification(
-                    result['url'],
-                    result['status'],
-                    result['error_message']
-                )
+            if response.status == 200 or (method == 'range' and response.status == 206):
+                result['status'] = 'success'
+            else:
+                result['status'] = 'failed'
+                result['error_message'] = f"HTTP {response.status}"
+                
+        except asyncio.TimeoutError as e:
+            # aiohttp 3.10+ tells connect timeouts apart
+            connect_error = getattr(aiohttp, 'ConnectionTimeoutError', ())
+            result['status'] = 'timeout'
+            result['error_message'] = self.timeout_message(
+                connect_timeout, read_timeout, isinstance(e, connect_error))
+            result['response_time'] = round(time.perf_counter() - start_time, 3)
+            
+        except aiohttp.ClientConnectionError:
+            result['status'] = 'connection_error'
+            result['error_message'] = 'Connection failed'
+            result['response_time'] = round(time.perf_counter() - start_time, 3)
+            
+        except (aiohttp.ClientError, ValueError) as e:
+            result['status'] = 'error'
+            result['error_message'] = str(e) or e.__class__.__name__
+            result['response_time'] = round(time.perf_counter() - start_time, 3)
+        
+        for phase in ('dns', 'connect'):
+            if phase in phases:
+                result[f'{phase}_time'] = round(phases[phase], 3)
+        
+        return result
     
-    def run_continuous(self, interval_minutes: int = 1):
-        """Run continuous monitoring with specified interval."""
-        interval_seconds = interval_minutes * 60
+    async def check_urls(self, urls: List[str],
+                         on_result: Optional[Callable[[Dict], None]] = None,
+                         deadline: Optional[float] = None) -> List[Dict]:
+        """Check URLs concurrently on the event loop and record each result.
         
-        print(f"\nStarting continuous monitoring (checking every {interval_minutes} minute(s))...")
-        print("Press Ctrl+C to stop.\n")
+        Results are recorded and passed to ``on_result`` as each check
+        completes; the returned list is in the same order as ``urls``.
+        Checks still pending after ``deadline`` seconds are cancelled and
+        recorded with status 'skipped'.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        def finish(result: Dict) -> Dict:
+            self.record_result(result)
+            if on_result:
+                on_result(result)
+            return result
+        
+        async def run_one(url: str) -> Dict:
+            async with semaphore:
+                result = await self.check_url(url)
+            return finish(result)
+        
+        tasks = [asyncio.create_task(run_one(url)) for url in urls]
+        pending = set()
+        try:
+            if deadline is not None and tasks:
+                _, pending = await asyncio.wait(tasks, timeout=deadline)
+                for task in pending:
+                    task.cancel()
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        except asyncio.CancelledError:
+            # The sweep itself was cancelled (e.g. Ctrl+C); stop its checks too
+            for task in tasks:
+                task.cancel()
+            raise
+        
+        results = []
+        for url, task, outcome in zip(urls, tasks, outcomes):
+            if task in pending and isinstance(outcome, asyncio.CancelledError):
+                outcome = finish(self.skipped_result(
+                    url, f"Sweep deadline ({deadline:g}s) reached"))
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            results.append(outcome)
+        return results
+    
+    async def check_all_urls(self, deadline: Optional[float] = None) -> List[Dict]:
+        """Check all URLs and log results, giving up after ``deadline`` seconds."""
+        urls = self.urls  # Edits made during the sweep apply to the next one
+        if not urls:
+            print("No URLs to check. Please add URLs first.")
+            return []
+        
+        print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Checking {len(urls)} URL(s)...")
+        
+        return await self.check_urls(urls, on_result=self.print_result, deadline=deadline)
+    
+    async def run_scheduled(self, interval_seconds: float,
+                            on_result: Optional[Callable[[Dict], None]] = None,
+                            spread: bool = False, jitter: float = 0.0,
+                            backoff_cap: Optional[float] = None):
+        """Check each URL whenever it comes due, on the event loop.
+        
+        Same scheduling rules as ``ServerStatusChecker.run_scheduled``.
+        """
+        scheduler = CheckScheduler(interval_seconds, self.get_interval,
+                                   spread=spread, jitter=jitter, backoff_cap=backoff_cap)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        in_flight: Dict[str, asyncio.Task] = {}
+        synced_version = None  # Target registry version the scheduler has seen
+        
+        async def probe(url: str, start_by: float):
+            try:
+                async with semaphore:
+                    if time.monotonic() > start_by:
+                        result = self.skipped_result(
+                            url, "Check could not start before its next slot")
+                    else:
+                        result = await self.check_url(url)
+                        scheduler.record_result(url, result['status'] == 'success')
+                self.record_result(result)
+                if on_result:
+                    on_result(result)
+            except Exception as e:
+                print(f"Error checking {url}: {e}")
+            finally:
+                in_flight.pop(url, None)
         
         try:
             while True:
-                self.check_all_urls()
-                print(f"\nWaiting {interval_minutes} minute(s) until next check...\n")
-                time.sleep(interval_seconds)
-        except KeyboardInterrupt:
-            print("\n\nMonitoring stopped by user.")
+                targets = self.targets.snapshot()
+                if targets.version != synced_version:
+                    scheduler.sync(targets.urls)
+                    synced_version = targets.version
+                for url, slot in scheduler.pop_due():
+                    if url not in in_flight:
+                        start_by = slot + scheduler.effective_interval(url)
+                        in_flight[url] = asyncio.create_task(probe(url, start_by))
+                
+                wait = scheduler.time_until_next()
+                await asyncio.sleep(1.0 if wait is None else min(wait, 1.0))
+        finally:
+            for task in list(in_flight.values()):
+                task.cancel()
+            await self.aclose()
+    
+    def _monitor(self, interval_seconds: float, on_result: Callable[[Dict], None],
+                 spread: bool, jitter: float, backoff_cap: Optional[float]):
+        """Run the scheduler on a new event loop for run_continuous."""
+        asyncio.run(self.run_scheduled(interval_seconds, on_result=on_result,
+                                       spread=spread, jitter=jitter, backoff_cap=backoff_cap))
+    
+    def run_once(self, deadline: Optional[float] = None) -> List[Dict]:
+        """Check all URLs once from synchronous code."""
+        async def run():
+            try:
+                return await self.check_all_urls(deadline=deadline)
+            finally:
+                await self.aclose()
+        
+        return asyncio.run(run())
 
 
 def interactive_mode():
@@ -258,17 +2939,20 @@ def interactive_mode():
     print("Server Status Checker - Interactive Mode")
     print("=" * 60)
     print("\nCommands:")
-    print("  add <url>     - Add a URL to monitor")
+    print("  add <url>     - Add a URL to monitor (optionally: add <url> interval=10s)")
+    print("  import <file> - Add every URL listed in a file")
     print("  list          - List all URLs")
     print("  remove <url>  - Remove a URL")
     print("  check         - Check all URLs once")
+    print("  status        - Show the latest status of all URLs")
     print("  start         - Start continuous monitoring (every 1 minute)")
     print("  quit          - Exit")
     print("\n" + "=" * 60 + "\n")
     
     while True:
         try:
-            command = input("> ").strip().lower()
+            line = input("> ").strip()
+            command = line.lower()
             
             if command == 'quit' or command == 'exit':
                 print("Goodbye!")
@@ -287,13 +2971,14 @@ def interactive_mode():
                 url = command[4:].strip()
                 checker.add_url(url)
             
+            elif command.startswith('import '):
+                checker.import_urls(line[7:].strip())  # File names keep their case
+            
             elif command.startswith('remove '):
                 url = command[7:].strip()
                 if not url.startswith(('http://', 'https://')):
                     url = 'https://' + url
-                if url in checker.urls:
-                    checker.urls.remove(url)
-                    checker.save_urls()
+                if checker.remove_url(url):
                     print(f"Removed URL: {url}")
                 else:
                     print(f"URL not found: {url}")
@@ -302,6 +2987,10 @@ def interactive_mode():
                 checker.check_all_urls()
                 print()
             
+            elif command == 'status':
+                checker.print_current_status()
+                print()
+            
             elif command == 'start':
                 checker.run_continuous(interval_minutes=1)
                 break
@@ -319,20 +3008,73 @@ def interactive_mode():
 if __name__ == "__main__":
     if len(sys.argv) > 1:
         # Command line mode
-        checker = ServerStatusChecker()
-        
-        if sys.argv[1] == 'add' and len(sys.argv) > 2:
-            checker.add_url(sys.argv[2])
-        elif sys.argv[1] == 'check':
-            checker.check_all_urls()
-        elif sys.argv[1] == 'start':
-            checker.run_continuous(interval_minutes=1)
+        use_async = '--async' in sys.argv
+        spread = '--spread' in sys.argv
+        storage_profile = 'default'
+        jitter = 0.0
+        retention = None
+        backoff_cap = None
+        deadline = None
+        notifiers = None
+        args = []
+        for arg in sys.argv[1:]:
+            if arg.startswith('--storage='):
+                storage_profile = arg.split('=', 1)[1]
+            elif arg.startswith('--jitter='):
+                jitter = float(arg.split('=', 1)[1])
+            elif arg.startswith('--retention='):
+                retention = RetentionPolicy(raw_age=parse_duration(arg.split('=', 1)[1]))
+            elif arg.startswith('--deadline='):
+                deadline = parse_duration(arg.split('=', 1)[1])
+            elif arg.startswith('--backoff='):
+                backoff_cap = parse_duration(arg.split('=', 1)[1])
+            elif arg.startswith('--notify='):
+                if notifiers is None:
+                    notifiers = [WindowsNotifier()] if WINDOWS_NOTIFICATIONS_AVAILABLE else []
+                notifiers.append(parse_notifier(arg.split('=', 1)[1]))
+            elif arg not in ('--async', '--spread'):
+                args.append(arg)
+        if use_async:
+            checker = AsyncServerStatusChecker(storage_profile=storage_profile,
+                                               retention=retention, notifiers=notifiers)
+        else:
+            checker = ServerStatusChecker(storage_profile=storage_profile,
+                                          retention=retention, notifiers=notifiers)
+        
+        if args and args[0] == 'add' and len(args) > 1:
+            try:
+                checker.add_url(" ".join(args[1:]))
+            except ValueError as e:
+                print(f"Error: {e}")
+                print("Usage: python server_status_checker.py add <url> [interval=10s] [method=head]")
+        elif args and args[0] == 'import' and len(args) > 1:
+            checker.import_urls(args[1])
+        elif args and args[0] == 'check':
+            if use_async:
+                checker.run_once(deadline=deadline)
+            else:
+                checker.check_all_urls(deadline=deadline)
+        elif args and args[0] == 'status':
+            checker.print_current_status()
+        elif args and args[0] == 'start':
+            checker.run_continuous(interval_minutes=1, spread=spread, jitter=jitter,
+                                   backoff_cap=backoff_cap)
         else:
             print("Usage:")
             print("  python server_status_checker.py              # Interactive mode")
-            print("  python server_status_checker.py add <url>    # Add URL")
+            print("  python server_status_checker.py add <url> [interval=10s]  # Add URL")
+            print("  python server_status_checker.py import <file> # Add every URL in a file ('-' for stdin)")
             print("  python server_status_checker.py check        # Check once")
+            print("  python server_status_checker.py status       # Show latest status")
             print("  python server_status_checker.py start         # Start monitoring")
+            print("  Add --async to check/start to use the asyncio backend (needs aiohttp)")
+            print("  Add --storage=wal to use WAL journaling for status_log.db")
+            print("  Add --spread (and optionally --jitter=0.1) to start to stagger checks")
+            print("  Add --retention=30d to delete raw check results older than 30 days")
+            print("  Add --deadline=30s to check to give up on checks still running after 30s")
+            print("  Add --backoff=10m to start to check failing URLs less often (at least every 10m)")
+            print("  Add --notify=webhook:<url>, file:<path>, syslog[:<host>] or smtp://... "
+                  "to send alerts there (repeatable)")
     else:
         # Interactive mode
         interactive_mode()
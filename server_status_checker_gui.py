@@ -5,33 +5,112 @@ Monitors URLs and sends alerts when servers are down or fail.
 """
 
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
+from tkinter import ttk, scrolledtext, messagebox, filedialog
+import queue
 import threading
 import time
-from datetime import datetime
-from server_status_checker import ServerStatusChecker
+from datetime import datetime, timedelta
+from server_status_checker import AlertTracker, ServerStatusChecker
+
+
+def downsample_lttb(points: list, threshold: int) -> list:
+    """Reduce (x, y) points to at most ``threshold`` while keeping the shape.
+    
+    Largest-Triangle-Three-Buckets: the first and last points are kept and
+    each bucket in between contributes the point that forms the largest
+    triangle with the previously chosen point and the next bucket's average.
+    """
+    if threshold < 3 or len(points) <= threshold:
+        return list(points)
+    
+    sampled = [points[0]]
+    bucket_size = (len(points) - 2) / (threshold - 2)
+    previous = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_bucket = points[end:min(int((i + 2) * bucket_size) + 1, len(points))] or [points[-1]]
+        avg_x = sum(point[0] for point in next_bucket) / len(next_bucket)
+        avg_y = sum(point[1] for point in next_bucket) / len(next_bucket)
+        
+        prev_x, prev_y = points[previous]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            x, y = points[j]
+            area = abs((prev_x - avg_x) * (y - prev_y) - (prev_x - x) * (avg_y - prev_y))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        previous = best
+    sampled.append(points[-1])
+    return sampled
 
 
 class ServerStatusCheckerGUI:
+    REFRESH_MS = 250        # How often queued log lines are drawn
+    LOG_BATCH_SIZE = 1000   # Most log lines drawn per refresh
+    MAX_LOG_LINES = 5000    # Oldest lines are trimmed beyond this
+    TABLE_ROW_HEIGHT = 22   # Pixels per status table row
+    TABLE_HEADER_HEIGHT = 26
+    TABLE_DATA_REFRESH_S = 60  # How often uptime figures are reloaded
+    HISTORY_RANGES = {"1 hour": 3600, "24 hours": 86400, "7 days": 7 * 86400,
+                      "30 days": 30 * 86400}
+    HISTORY_MAX_CHECKS = 200000  # Most raw checks loaded for one chart
+    HISTORY_MARGIN = 50          # Pixels left of the plot for the axis labels
+    TABLE_COLUMNS = (
+        # (column, heading, width, anchor)
+        ('url', "URL", 360, tk.W),
+        ('state', "State", 90, tk.CENTER),
+        ('code', "Code", 60, tk.CENTER),
+        ('latency', "Latency", 80, tk.E),
+        ('uptime', "Uptime (24h)", 90, tk.E),
+        ('last_change', "Last change", 140, tk.CENTER),
+    )
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Server Status Checker")
-        self.root.geometry("900x700")
+        self.root.geometry("1000x900")
         self.root.resizable(True, True)
         
         # Check for win10toast availability
         self.check_notifications_available()
         
-        # Initialize checker
-        self.checker = ServerStatusChecker()
+        # Initialize checker (WAL keeps the GUI from blocking a running CLI)
+        self.checker = ServerStatusChecker(storage_profile='wal')
         self.monitoring = False
         self.monitoring_thread = None
+        self.monitoring_stop = threading.Event()
+        
+        # Log lines from any thread; drawn by auto_refresh on the Tk thread
+        self.log_queue = queue.SimpleQueue()
+        
+        # Status table model. Only the visible rows exist as Treeview items;
+        # they show table_urls[table_offset:] and are refreshed in place.
+        self.table_urls = ()
+        self.table_version = None  # Target registry version shown in the table
+        self.table_rows = {}     # url -> state, code, latency, uptime, last_change
+        self.table_offset = 0
+        self.table_slots = []    # Treeview item ids, top to bottom
+        self.table_shown = []    # (values, tags) currently drawn in each slot
+        self.selected_url = None
+        self.pending_results = {}     # Latest result per URL from worker threads
+        self.pending_table_data = None
+        self.table_lock = threading.Lock()
+        self.next_table_data_load = 0.0
+        
+        # History chart: loaded and downsampled off the Tk thread
+        self.history_url = None
+        self.history_request = 0
+        self.pending_history = None
+        self.history_resize_job = None
         
         # Create GUI
         self.create_widgets()
         
         # Load URLs into listbox
         self.refresh_url_list()
+        self.log_message(self.checker.storage_info, "info")
         
         # Start auto-refresh if monitoring
         self.auto_refresh()
@@ -73,7 +152,8 @@ class ServerStatusCheckerGUI:
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(0, weight=1)
         main_frame.columnconfigure(1, weight=1)
-        main_frame.rowconfigure(2, weight=1)
+        main_frame.rowconfigure(1, weight=1)
+        main_frame.rowconfigure(3, weight=1)
         
         # Title
         title_label = ttk.Label(main_frame, text="Server Status Monitor", 
@@ -82,8 +162,10 @@ class ServerStatusCheckerGUI:
         
         # URL Management Section
         url_frame = ttk.LabelFrame(main_frame, text="URL Management", padding="10")
-        url_frame.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
+        url_frame.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S),
+                       pady=(0, 10))
         url_frame.columnconfigure(1, weight=1)
+        url_frame.rowconfigure(1, weight=1)
         
         # Add URL
         ttk.Label(url_frame, text="URL:").grid(row=0, column=0, padx=(0, 5), sticky=tk.W)
@@ -94,21 +176,41 @@ class ServerStatusCheckerGUI:
         add_btn = ttk.Button(url_frame, text="Add URL", command=self.add_url)
         add_btn.grid(row=0, column=2, padx=(0, 5))
         
+        import_btn = ttk.Button(url_frame, text="Import...", command=self.import_urls)
+        import_btn.grid(row=0, column=3, padx=(0, 5))
+        
         remove_btn = ttk.Button(url_frame, text="Remove Selected", command=self.remove_url)
-        remove_btn.grid(row=0, column=3)
+        remove_btn.grid(row=0, column=4)
         
-        # URL List
+        # URL status table
         list_frame = ttk.Frame(url_frame)
-        list_frame.grid(row=1, column=0, columnspan=4, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(10, 0))
+        list_frame.grid(row=1, column=0, columnspan=5, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(10, 0))
         list_frame.columnconfigure(0, weight=1)
         list_frame.rowconfigure(0, weight=1)
         
-        scrollbar = ttk.Scrollbar(list_frame)
-        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        
-        self.url_listbox = tk.Listbox(list_frame, height=6, yscrollcommand=scrollbar.set)
-        self.url_listbox.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        scrollbar.config(command=self.url_listbox.yview)
+        style = ttk.Style()
+        style.configure("Status.Treeview", rowheight=self.TABLE_ROW_HEIGHT)
+        self.status_table = ttk.Treeview(list_frame, style="Status.Treeview", show="headings",
+                                         selectmode="browse", height=8,
+                                         columns=[column[0] for column in self.TABLE_COLUMNS])
+        for column, heading, width, anchor in self.TABLE_COLUMNS:
+            self.status_table.heading(column, text=heading, anchor=anchor)
+            self.status_table.column(column, width=width, anchor=anchor, stretch=(column == 'url'))
+        self.status_table.tag_configure("up", foreground="green")
+        self.status_table.tag_configure("degraded", foreground="orange")
+        self.status_table.tag_configure("down", foreground="red")
+        self.status_table.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        self.table_scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL,
+                                             command=self.scroll_table)
+        self.table_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        
+        self.status_table.bind('<Configure>', self.resize_table)
+        self.status_table.bind('<<TreeviewSelect>>', self.on_table_select)
+        self.status_table.bind('<MouseWheel>',
+                               lambda e: self.scroll_table('scroll', -e.delta // 120, 'units'))
+        self.status_table.bind('<Button-4>', lambda e: self.scroll_table('scroll', -1, 'units'))
+        self.status_table.bind('<Button-5>', lambda e: self.scroll_table('scroll', 1, 'units'))
         
         # Control Buttons Section
         control_frame = ttk.Frame(main_frame)
@@ -150,14 +252,56 @@ class ServerStatusCheckerGUI:
         # Clear log button
         clear_btn = ttk.Button(log_frame, text="Clear Log", command=self.clear_log)
         clear_btn.grid(row=1, column=0, pady=(10, 0))
+        
+        # History Section (latency of the selected URL)
+        history_frame = ttk.LabelFrame(main_frame, text="History", padding="10")
+        history_frame.grid(row=4, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(10, 0))
+        history_frame.columnconfigure(0, weight=1)
+        
+        history_controls = ttk.Frame(history_frame)
+        history_controls.grid(row=0, column=0, sticky=(tk.W, tk.E))
+        history_controls.columnconfigure(0, weight=1)
+        self.history_label = ttk.Label(history_controls, text="Select a URL to see its history")
+        self.history_label.grid(row=0, column=0, sticky=tk.W)
+        self.history_range = ttk.Combobox(history_controls, values=list(self.HISTORY_RANGES),
+                                          state="readonly", width=10)
+        self.history_range.set("24 hours")
+        self.history_range.grid(row=0, column=1, padx=(0, 5))
+        self.history_range.bind('<<ComboboxSelected>>', lambda e: self.show_history())
+        refresh_btn = ttk.Button(history_controls, text="Refresh", command=self.show_history)
+        refresh_btn.grid(row=0, column=2)
+        
+        self.history_canvas = tk.Canvas(history_frame, height=160, background="white",
+                                        highlightthickness=0)
+        self.history_canvas.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(5, 0))
+        self.history_canvas.bind('<Configure>', self.on_history_resize)
     
     def log_message(self, message: str, tag: str = ""):
-        """Add a message to the log display."""
-        self.log_text.config(state=tk.NORMAL)
+        """Queue a message for the log display (safe to call from any thread)."""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.log_text.insert(tk.END, f"[{timestamp}] {message}\n", tag)
-        self.log_text.see(tk.END)
+        self.log_queue.put((f"[{timestamp}] {message}\n", tag))
+    
+    def flush_log(self):
+        """Draw queued log messages in one batch and trim the oldest lines."""
+        lines = []  # Alternating text and tag, as Text.insert accepts them
+        for _ in range(self.LOG_BATCH_SIZE):
+            try:
+                lines.extend(self.log_queue.get_nowait())
+            except queue.Empty:
+                break
+        if not lines:
+            return
+        
+        # Only follow new lines if the user has not scrolled up
+        at_bottom = self.log_text.yview()[1] >= 1.0
+        self.log_text.config(state=tk.NORMAL)
+        self.log_text.insert(tk.END, *lines)
+        line_count = int(self.log_text.index('end-1c').split('.')[0])
+        if line_count > self.MAX_LOG_LINES:
+            self.log_text.delete("1.0", f"{line_count - self.MAX_LOG_LINES + 1}.0")
         self.log_text.config(state=tk.DISABLED)
+        if at_bottom:
+            self.log_text.see(tk.END)
     
     def clear_log(self):
         """Clear the log display."""
@@ -166,10 +310,140 @@ class ServerStatusCheckerGUI:
         self.log_text.config(state=tk.DISABLED)
     
     def refresh_url_list(self):
-        """Refresh the URL listbox with current URLs."""
-        self.url_listbox.delete(0, tk.END)
-        for url in self.checker.urls:
-            self.url_listbox.insert(tk.END, url)
+        """Refresh the status table with the current URLs."""
+        targets = self.checker.targets.snapshot()
+        if targets.version == self.table_version:
+            return
+        self.table_version = targets.version
+        self.table_urls = targets.urls
+        self.set_table_offset(self.table_offset)
+    
+    def resize_table(self, event=None):
+        """Create one Treeview item per row that fits in the table."""
+        height = self.status_table.winfo_height()
+        rows = max(1, (height - self.TABLE_HEADER_HEIGHT) // self.TABLE_ROW_HEIGHT)
+        if rows == len(self.table_slots):
+            return
+        while len(self.table_slots) < rows:
+            self.table_slots.append(self.status_table.insert('', tk.END, values=()))
+            self.table_shown.append(None)
+        while len(self.table_slots) > rows:
+            self.status_table.delete(self.table_slots.pop())
+            self.table_shown.pop()
+        self.set_table_offset(self.table_offset)
+    
+    def scroll_table(self, action, amount, unit=None):
+        """Scrollbar and mouse wheel handler for the status table."""
+        if action == 'moveto':
+            offset = int(float(amount) * len(self.table_urls))
+        elif unit == 'pages':
+            offset = self.table_offset + int(amount) * max(1, len(self.table_slots) - 1)
+        else:
+            offset = self.table_offset + int(amount)
+        self.set_table_offset(offset)
+        return "break"
+    
+    def set_table_offset(self, offset: int):
+        """Scroll the status table so that row ``offset`` is at the top."""
+        last_offset = max(0, len(self.table_urls) - len(self.table_slots))
+        self.table_offset = min(max(0, offset), last_offset)
+        self.render_table()
+    
+    def on_table_select(self, event=None):
+        """Remember which URL is selected, whichever row it is drawn in."""
+        selection = self.status_table.selection()
+        if selection and selection[0] in self.table_slots:
+            index = self.table_offset + self.table_slots.index(selection[0])
+            if index < len(self.table_urls):
+                self.selected_url = self.table_urls[index]
+                if self.selected_url != self.history_url:
+                    self.show_history()
+    
+    def table_row_values(self, url: str):
+        """Return the (values, tags) of the status table row for a URL."""
+        row = self.table_rows.get(url, {})
+        state = row.get('state')
+        latency = row.get('latency')
+        uptime = row.get('uptime')
+        last_change = row.get('last_change')
+        values = (
+            url,
+            state.upper() if state else "-",
+            row.get('code') or "",
+            f"{latency * 1000:.0f} ms" if latency is not None else "",
+            f"{uptime:.2f}%" if uptime is not None else "",
+            str(last_change)[:19] if last_change else "",
+        )
+        return values, (state,) if state else ()
+    
+    def render_table(self):
+        """Redraw the visible rows of the status table that have changed."""
+        for i, item in enumerate(self.table_slots):
+            index = self.table_offset + i
+            if index < len(self.table_urls):
+                shown = self.table_row_values(self.table_urls[index])
+            else:
+                shown = (("",) * len(self.TABLE_COLUMNS), ())
+            if self.table_shown[i] != shown:
+                self.status_table.item(item, values=shown[0], tags=shown[1])
+                self.table_shown[i] = shown
+        
+        # Keep the selection on its URL while rows scroll past
+        visible = self.table_urls[self.table_offset:self.table_offset + len(self.table_slots)]
+        selection = ()
+        if self.selected_url in visible:
+            selection = (self.table_slots[visible.index(self.selected_url)],)
+        if self.status_table.selection() != selection:
+            self.status_table.selection_set(selection)
+        
+        total = max(1, len(self.table_urls))
+        self.table_scrollbar.set(self.table_offset / total,
+                                 min(1.0, (self.table_offset + len(self.table_slots)) / total))
+    
+    def load_table_data(self):
+        """Load the latest status and uptime of every URL (runs in a separate thread)."""
+        try:
+            data = (self.checker.get_current_status(), self.checker.get_uptimes())
+        except Exception as e:
+            self.log_message(f"Could not load status table data: {e}", "warning")
+            return
+        with self.table_lock:
+            self.pending_table_data = data
+    
+    def update_table(self):
+        """Apply new results and loaded data to the status table model, then redraw."""
+        with self.table_lock:
+            results, self.pending_results = self.pending_results, {}
+            data, self.pending_table_data = self.pending_table_data, None
+        
+        if data is not None:
+            current_status, uptimes = data
+            tracker = self.checker.alert_tracker
+            for url, status in current_status.items():
+                row = self.table_rows.setdefault(url, {})
+                if 'state' in row:
+                    continue  # Already updated by a check in this session
+                if status['status'] == 'success':
+                    row['state'] = AlertTracker.UP
+                elif status['consecutive_failures'] >= tracker.down_failures:
+                    row['state'] = AlertTracker.DOWN
+                else:
+                    row['state'] = AlertTracker.DEGRADED
+                row['code'] = status['status_code']
+                row['latency'] = status['response_time']
+                row['last_change'] = status['since']
+            for url, uptime in uptimes.items():
+                self.table_rows.setdefault(url, {})['uptime'] = uptime
+        
+        for url, result in results.items():
+            row = self.table_rows.setdefault(url, {})
+            if result.get('state') != row.get('state'):
+                row['last_change'] = result['timestamp']
+            row['state'] = result.get('state')
+            row['code'] = result['status_code']
+            row['latency'] = result['response_time']
+        
+        self.render_table()
     
     def add_url(self):
         """Add a URL from the entry field."""
@@ -178,59 +452,77 @@ class ServerStatusCheckerGUI:
             messagebox.showwarning("Warning", "Please enter a URL")
             return
         
-        if self.checker.add_url(url):
+        try:
+            added = self.checker.add_url(url)
+        except ValueError as e:
+            messagebox.showwarning("Warning", f"{e}\n\nOptions follow the URL, "
+                                              "e.g. example.com interval=10s")
+            return
+        
+        if added:
             self.url_entry.delete(0, tk.END)
             self.refresh_url_list()
             self.log_message(f"Added URL: {url}", "info")
         else:
             messagebox.showinfo("Info", f"URL already exists: {url}")
     
+    def import_urls(self):
+        """Add every URL listed in a file chosen by the user."""
+        path = filedialog.askopenfilename(title="Import URLs",
+                                          filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            added = self.checker.import_urls(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not import {path}: {e}")
+            return
+        self.refresh_url_list()
+        self.log_message(f"Imported {len(added)} new URL(s) from {path}", "info")
+    
     def remove_url(self):
         """Remove selected URL from the list."""
-        selection = self.url_listbox.curselection()
-        if not selection:
+        if self.selected_url is None or self.selected_url not in self.checker.targets:
             messagebox.showwarning("Warning", "Please select a URL to remove")
             return
         
-        url = self.url_listbox.get(selection[0])
-        if url in self.checker.urls:
-            self.checker.urls.remove(url)
-            self.checker.save_urls()
+        url = self.selected_url
+        if self.checker.remove_url(url):
+            self.selected_url = None
             self.refresh_url_list()
             self.log_message(f"Removed URL: {url}", "info")
     
     def check_urls_threaded(self):
         """Check all URLs in a separate thread."""
-        if not self.checker.urls:
+        urls = self.checker.urls  # URLs edited during the check apply to the next one
+        if not urls:
             self.log_message("No URLs to check. Please add URLs first.", "warning")
             return
         
-        self.log_message(f"Checking {len(self.checker.urls)} URL(s)...", "info")
-        
-        for url in self.checker.urls:
-            result = self.checker.check_url(url)
-            self.checker.log_status(result)
-            
-            # Update GUI with result
-            if result['status'] == 'success':
-                status_msg = (f"✓ {url} - Status: {result['status']} | "
-                            f"Code: {result['status_code']} | "
-                            f"Time: {result['response_time']}s")
-                self.log_message(status_msg, "success")
-            else:
-                status_msg = (f"✗ {url} - Status: {result['status']} | "
-                            f"Code: {result['status_code'] or 'N/A'} | "
-                            f"Time: {result['response_time'] or 'N/A'}s")
-                if result['error_message']:
-                    status_msg += f" | Error: {result['error_message']}"
-                self.log_message(status_msg, "error")
-                
-                # Send notification
-                self.checker.send_notification(
-                    result['url'],
-                    result['status'],
-                    result['error_message']
-                )
+        self.log_message(f"Checking {len(urls)} URL(s)...", "info")
+        self.checker.check_urls(urls, on_result=self.show_result)
+    
+    def show_result(self, result: dict):
+        """Show a single check result in the log display and status table."""
+        if result['status'] != 'skipped':
+            with self.table_lock:
+                self.pending_results[result['url']] = result
+        
+        url = result['url']
+        if result['status'] == 'success':
+            status_msg = (f"✓ {url} - Status: {result['status']} | "
+                        f"Code: {result['status_code']} | "
+                        f"Time: {result['response_time']}s")
+            if result.get('ttfb') is not None:
+                status_msg += f" (TTFB: {result['ttfb']}s)"
+            self.log_message(status_msg, "success")
+        else:
+            status_msg = (f"✗ {url} - Status: {result['status']} | "
+                        f"Code: {result['status_code'] or 'N/A'} | "
+                        f"Time: {result['response_time'] or 'N/A'}s")
+            if result['error_message']:
+                status_msg += f" | Error: {result['error_message']}"
+            self.log_message(status_msg, "error")
     
     def check_once(self):
         """Check all URLs once."""
@@ -256,9 +548,11 @@ class ServerStatusCheckerGUI:
         self.stop_btn.config(state=tk.NORMAL)
         self.status_label.config(text="Status: Monitoring...", foreground="green")
         
-        self.log_message("Monitoring started (checking every 1 minute)", "info")
+        self.log_message("Monitoring started (checking every 1 minute unless a URL "
+                         "sets its own interval)", "info")
         
         # Start monitoring in separate thread
+        self.monitoring_stop = threading.Event()
         self.monitoring_thread = threading.Thread(target=self.monitoring_loop, daemon=True)
         self.monitoring_thread.start()
     
@@ -268,6 +562,7 @@ class ServerStatusCheckerGUI:
             return
         
         self.monitoring = False
+        self.monitoring_stop.set()
         self.start_btn.config(state=tk.NORMAL)
         self.stop_btn.config(state=tk.DISABLED)
         self.status_label.config(text="Status: Stopped", foreground="gray")
@@ -276,23 +571,131 @@ class ServerStatusCheckerGUI:
     
     def monitoring_loop(self):
         """Main monitoring loop (runs in separate thread)."""
-        while self.monitoring:
-            # Check all URLs
-            self.check_urls_threaded()
-            
-            # Wait 1 minute (60 seconds)
-            for _ in range(60):
-                if not self.monitoring:
-                    break
-                time.sleep(1)
-            
-            if self.monitoring:
-                self.log_message("Waiting 1 minute until next check...", "info")
+        self.checker.run_scheduled(60, on_result=self.show_result,
+                                   stop_event=self.monitoring_stop)
+    
+    def show_history(self):
+        """Load the history chart of the selected URL in a separate thread."""
+        url = self.selected_url
+        if url is None:
+            return
+        self.history_url = url
+        self.history_request += 1
+        range_name = self.history_range.get()
+        self.history_label.config(text=f"{url} - loading last {range_name}...")
+        width = max(10, self.history_canvas.winfo_width() - self.HISTORY_MARGIN)
+        thread = threading.Thread(target=self.load_history, daemon=True,
+                                  args=(self.history_request, url,
+                                        self.HISTORY_RANGES[range_name], width))
+        thread.start()
+    
+    def on_history_resize(self, event=None):
+        """Reload the chart for the new width once resizing has settled."""
+        if self.history_resize_job is not None:
+            self.root.after_cancel(self.history_resize_job)
+        self.history_resize_job = self.root.after(300, self.show_history)
+    
+    def load_history(self, request: int, url: str, seconds: int, width: int):
+        """Read and downsample a URL's latency history (runs in a separate thread).
+        
+        Ranges up to a day use the individual checks; longer ranges use the
+        per-minute rollups, or the hourly ones once those have expired.
+        """
+        until = datetime.now()
+        since = until - timedelta(seconds=seconds)
+        points = []  # (time, latency or None, success)
+        try:
+            if seconds <= 86400:
+                history = self.checker.get_history(url, since=since,
+                                                   limit=self.HISTORY_MAX_CHECKS)
+                source = "checks"
+                for check in reversed(history['checks']):
+                    latency = check['response_time'] if check['status_code'] is not None else None
+                    points.append((datetime.fromisoformat(check['timestamp']).timestamp(),
+                                   latency, check['status'] == 'success'))
+            else:
+                source = "per-minute averages"
+                buckets = self.checker.get_rollups(url, '1m', since=since)
+                # Fall back to hourly data where the per-minute rollups have expired
+                if not buckets or (datetime.fromisoformat(str(buckets[0]['bucket_start']))
+                                   > since + timedelta(days=1)):
+                    source = "hourly averages"
+                    buckets = self.checker.get_rollups(url, '1h', since=since)
+                for bucket in buckets:
+                    points.append((datetime.fromisoformat(str(bucket['bucket_start'])).timestamp(),
+                                   bucket['latency_avg'],
+                                   bucket['success_count'] == bucket['count']))
+        except Exception as e:
+            self.log_message(f"Could not load history for {url}: {e}", "warning")
+            return
+        
+        # One latency point per pixel column; failures as pixel positions
+        start, span = since.timestamp(), max(1.0, seconds)
+        latencies = downsample_lttb([(t, latency) for t, latency, _ in points
+                                     if latency is not None], width)
+        failures = sorted({int((t - start) / span * width) for t, _, success in points
+                           if not success})
+        with self.table_lock:
+            self.pending_history = (request, url, start, span, width, latencies, failures,
+                                    len(points), source)
+    
+    def draw_history(self, history):
+        """Draw a loaded history chart on the canvas."""
+        request, url, start, span, width, latencies, failures, count, source = history
+        if request != self.history_request:
+            return  # A newer chart has been requested since
+        
+        canvas = self.history_canvas
+        canvas.delete("all")
+        height = canvas.winfo_height()
+        left, top, bottom = self.HISTORY_MARGIN, 10, height - 20
+        self.history_label.config(
+            text=f"{url} - {count} {source}, {len(failures)} with failures "
+                 f"(last {self.history_range.get()})")
+        
+        canvas.create_line(left, bottom, left + width, bottom, fill="gray")
+        canvas.create_text(left, bottom + 10, anchor=tk.W, fill="gray",
+                           text=datetime.fromtimestamp(start).strftime("%Y-%m-%d %H:%M"))
+        canvas.create_text(left + width, bottom + 10, anchor=tk.E, fill="gray", text="now")
+        
+        if latencies:
+            peak = max(latency for _, latency in latencies) or 1.0
+            canvas.create_text(left - 5, top, anchor=tk.NE, fill="gray",
+                               text=f"{peak * 1000:.0f} ms")
+            canvas.create_text(left - 5, bottom, anchor=tk.E, fill="gray", text="0")
+            coords = []
+            for t, latency in latencies:
+                coords.append(left + (t - start) / span * width)
+                coords.append(bottom - latency / peak * (bottom - top))
+            if len(coords) >= 4:
+                canvas.create_line(*coords, fill="blue")
+            else:
+                x, y = coords
+                canvas.create_oval(x - 2, y - 2, x + 2, y + 2, fill="blue", outline="")
+        else:
+            canvas.create_text(left + width / 2, (top + bottom) / 2, fill="gray",
+                               text="No response times in this period")
+        
+        for x in failures:
+            canvas.create_line(left + x, bottom - 6, left + x, bottom, fill="red")
     
     def auto_refresh(self):
         """Auto-refresh function for status updates."""
-        # This can be used for real-time updates if needed
-        self.root.after(1000, self.auto_refresh)
+        self.flush_log()
+        self.refresh_url_list()  # No-op unless the URL list has changed
+        self.update_table()
+        
+        with self.table_lock:
+            history, self.pending_history = self.pending_history, None
+        if history is not None:
+            self.draw_history(history)
+        
+        # Reload uptime figures now and then, off the Tk thread
+        if time.monotonic() >= self.next_table_data_load:
+            self.next_table_data_load = time.monotonic() + self.TABLE_DATA_REFRESH_S
+            threading.Thread(target=self.load_table_data, daemon=True).start()
+        
+        self.root.after(self.REFRESH_MS, self.auto_refresh)
 
 
 def main():